@@ -117,6 +117,14 @@ def set_compliance_headers(response: Response, latest_observation_utc: str | Non
         response.headers[key] = value
 
 
+def get_cached_service() -> AntarcticService | None:
+    """Return the service if a request already built it, without opening the database or HTTP client."""
+    if _cached_service.cache_info().currsize == 0:
+        return None
+    # get_settings is cached too, so this is a hit on the instance built for the first request.
+    return _cached_service(get_settings())
+
+
 def clear_dependency_caches() -> None:
     _cached_repository.cache_clear()
     _cached_aemet_client.cache_clear()
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Callable, TypeVar
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException
 
+from app.services.antarctic.constants import UTC
+
 T = TypeVar("T")
 
 DATETIME_FORMAT_HINT = "YYYY-MM-DDTHH:MM:SS"
@@ -16,11 +19,21 @@ SERVICE_ERROR_RESPONSES = {
 }
 
 
-def parse_timezone_or_400(location: str) -> ZoneInfo:
+@lru_cache(maxsize=512)
+def _zoneinfo_or_none(location: str) -> ZoneInfo | None:
+    # ZoneInfo only keeps a handful of recently used zones strongly cached, and unknown keys are
+    # probed on disk every time; cache both outcomes per key.
     try:
         return ZoneInfo(location)
-    except Exception as exc:  # pragma: no cover - ZoneInfo exposes broad failures
-        raise HTTPException(status_code=400, detail=f"Invalid timezone location: {location}") from exc
+    except Exception:  # pragma: no cover - ZoneInfo exposes broad failures
+        return None
+
+
+def parse_timezone_or_400(location: str) -> ZoneInfo:
+    tz = _zoneinfo_or_none(location)
+    if tz is None:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone location: {location}")
+    return tz
 
 
 def coerce_datetime_to_timezone(value: datetime, tz: ZoneInfo) -> datetime:
@@ -68,7 +81,7 @@ def parse_optional_local_datetime_or_400(
 def to_utc_iso(value: datetime | None) -> str | None:
     if value is None:
         return None
-    return value.astimezone(ZoneInfo("UTC")).isoformat()
+    return value.astimezone(UTC).isoformat()
 
 
 def call_service_or_http(
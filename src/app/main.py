@@ -8,7 +8,7 @@ from fastapi import Request
 from fastapi.staticfiles import StaticFiles
 
 from app.api import get_service, router
-from app.api.dependencies import clear_dependency_caches, frontend_dist
+from app.api.dependencies import clear_dependency_caches, frontend_dist, get_cached_service
 from app.core.logging import configure_logging
 
 configure_logging()
@@ -25,13 +25,16 @@ OPENAPI_TAGS = [
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     yield
-    # Shutdown: close the persistent httpx.Client connection pool.
-    try:
-        service = get_service()
-        if hasattr(service, "aemet_client") and hasattr(service.aemet_client, "close"):
-            service.aemet_client.close()
-    except Exception:  # noqa: BLE001
-        pass
+    # Shutdown: close the persistent httpx.Client and pooled SQLite connections, if they were ever opened.
+    service = get_cached_service()
+    if service is not None:
+        try:
+            if hasattr(service, "aemet_client") and hasattr(service.aemet_client, "close"):
+                service.aemet_client.close()
+            if hasattr(service, "repository") and hasattr(service.repository, "close"):
+                service.repository.close()
+        except Exception:  # noqa: BLE001
+            pass
     clear_dependency_caches()
 
 
@@ -10,12 +10,13 @@ import unicodedata
 from datetime import datetime
 from io import StringIO
 from typing import Any
-from zoneinfo import ZoneInfo
 
 import httpx
 
 from app.core.exceptions import UpstreamServiceError
 from app.models import SourceMeasurement, StationCatalogItem
+from app.services.antarctic.constants import UTC
+from app.utils.serialization import json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,32 @@ class AemetClient:
     _ROW_LATITUDE_KEYS = ("lat", "latitud", "latitude")
     _ROW_LONGITUDE_KEYS = ("lon", "long", "longitud", "longitude", "lng")
     _ROW_ALTITUDE_KEYS = ("alt", "altitud", "altitude")
+    # Spanish/English compass points (normalized keys) -> degrees, for rows reporting text directions.
+    _CARDINAL_DIRECTIONS_DEG = {
+        "n": 0.0,
+        "nne": 22.5,
+        "ne": 45.0,
+        "ene": 67.5,
+        "e": 90.0,
+        "ese": 112.5,
+        "se": 135.0,
+        "sse": 157.5,
+        "s": 180.0,
+        "ssw": 202.5,
+        "sso": 202.5,
+        "sw": 225.0,
+        "so": 225.0,
+        "wsw": 247.5,
+        "oso": 247.5,
+        "w": 270.0,
+        "o": 270.0,
+        "wnw": 292.5,
+        "ono": 292.5,
+        "nw": 315.0,
+        "no": 315.0,
+        "nnw": 337.5,
+        "nno": 337.5,
+    }
 
     def __init__(
         self,
@@ -47,7 +74,12 @@ class AemetClient:
         self.min_request_interval_seconds = max(0.0, min_request_interval_seconds)
         cap = retry_after_cap_seconds if retry_after_cap_seconds is not None else self.min_request_interval_seconds
         self.retry_after_cap_seconds = max(self.min_request_interval_seconds, cap)
-        self._http_client = httpx.Client(timeout=self.timeout_seconds)
+        # Requests are throttled to one every few seconds, which outlives httpx's default 5s
+        # keep-alive; a longer expiry lets metadata and data downloads reuse one TLS session.
+        self._http_client = httpx.Client(
+            timeout=httpx.Timeout(self.timeout_seconds, connect=min(5.0, self.timeout_seconds)),
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=60.0),
+        )
 
     def close(self) -> None:
         """Close the underlying HTTP connection pool."""
@@ -204,7 +236,7 @@ class AemetClient:
             raise UpstreamServiceError(detail) from exc
 
         try:
-            payload = meta_response.json()
+            payload = json_loads(meta_response.content)
         except ValueError as exc:
             raise UpstreamServiceError("AEMET metadata response is not valid JSON") from exc
 
@@ -245,7 +277,7 @@ class AemetClient:
             raise UpstreamServiceError(detail) from exc
 
         try:
-            raw_items = data_response.json()
+            raw_items = json_loads(data_response.content)
         except ValueError as exc:
             json_rows = self._parse_json_rows(data_response.text)
             if json_rows is not None:
@@ -505,8 +537,8 @@ class AemetClient:
         except ValueError:
             return None
         if parsed.tzinfo is None:
-            return parsed.replace(tzinfo=ZoneInfo("UTC"))
-        return parsed.astimezone(ZoneInfo("UTC"))
+            return parsed.replace(tzinfo=UTC)
+        return parsed.astimezone(UTC)
 
     @classmethod
     def _to_direction_deg(cls, value: Any) -> float | None:
@@ -518,32 +550,7 @@ class AemetClient:
         token = cls._normalized_key(str(value))
         if not token or token in {"calma", "calm", "variable", "vrb"}:
             return None
-        cardinal_map = {
-            "n": 0.0,
-            "nne": 22.5,
-            "ne": 45.0,
-            "ene": 67.5,
-            "e": 90.0,
-            "ese": 112.5,
-            "se": 135.0,
-            "sse": 157.5,
-            "s": 180.0,
-            "ssw": 202.5,
-            "sso": 202.5,
-            "sw": 225.0,
-            "so": 225.0,
-            "wsw": 247.5,
-            "oso": 247.5,
-            "w": 270.0,
-            "o": 270.0,
-            "wnw": 292.5,
-            "ono": 292.5,
-            "nw": 315.0,
-            "no": 315.0,
-            "nnw": 337.5,
-            "nno": 337.5,
-        }
-        return cardinal_map.get(token)
+        return cls._CARDINAL_DIRECTIONS_DEG.get(token)
 
     @classmethod
     def _map_row(cls, row: dict[str, Any]) -> SourceMeasurement | None:
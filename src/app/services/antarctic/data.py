@@ -92,7 +92,7 @@ class DataMixin:
 
         rows = self.repository.get_measurements(station_id, start_utc, end_utc)
         transformed = self._aggregate(rows, aggregation)
-        return [self._to_output(row, selected_types, output_tz=output_tz) for row in transformed]
+        return self._to_outputs(transformed, selected_types, output_tz=output_tz)
 
     def refresh_data_range(
         self,
@@ -292,26 +292,29 @@ class DataMixin:
         return split_month_windows_covering_range(start_utc, end_utc)
 
     @staticmethod
-    def _to_output(
-        row: SourceMeasurement,
+    def _to_outputs(
+        rows: list[SourceMeasurement],
         selected_types: list[MeasurementType],
         output_tz: tzinfo,
-    ) -> OutputMeasurement:
-        local_dt = row.measured_at_utc.astimezone(output_tz)
+    ) -> list[OutputMeasurement]:
+        # Resolve the type filter once per request rather than once per row.
         include_all = not selected_types
         include_temperature = include_all or MeasurementType.TEMPERATURE in selected_types
         include_pressure = include_all or MeasurementType.PRESSURE in selected_types
         include_speed = include_all or MeasurementType.SPEED in selected_types
         include_direction = include_all or MeasurementType.DIRECTION in selected_types
 
-        return OutputMeasurement(
-            stationName=row.station_name,
-            datetime=local_dt,
-            temperature=row.temperature_c if include_temperature else None,
-            pressure=row.pressure_hpa if include_pressure else None,
-            speed=row.speed_mps if include_speed else None,
-            direction=row.direction_deg if include_direction else None,
-            latitude=row.latitude,
-            longitude=row.longitude,
-            altitude=row.altitude_m,
-        )
+        return [
+            OutputMeasurement(
+                stationName=row.station_name,
+                datetime=row.measured_at_utc.astimezone(output_tz),
+                temperature=row.temperature_c if include_temperature else None,
+                pressure=row.pressure_hpa if include_pressure else None,
+                speed=row.speed_mps if include_speed else None,
+                direction=row.direction_deg if include_direction else None,
+                latitude=row.latitude,
+                longitude=row.longitude,
+                altitude=row.altitude_m,
+            )
+            for row in rows
+        ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import calendar
 from datetime import datetime
-from math import atan2, ceil, cos, radians, sin
+from math import atan2, ceil, cos, degrees, radians, sin
 from statistics import fmean
 
 from app.models import TimeAggregation
@@ -25,12 +25,14 @@ def avg_angle_deg(values: list[float | None]) -> float | None:
     angles = [v for v in values if v is not None]
     if not angles:
         return None
-    x = sum(cos(radians(a)) for a in angles)
-    y = sum(sin(radians(a)) for a in angles)
+    x = 0.0
+    y = 0.0
+    for angle_rad in map(radians, angles):
+        x += cos(angle_rad)
+        y += sin(angle_rad)
     if x == 0 and y == 0:
         return None
-    angle = atan2(y, x)
-    return round((angle * 180.0 / 3.141592653589793) % 360, 3)
+    return round(degrees(atan2(y, x)) % 360, 3)
 
 
 def dominant_angle_deg(values: list[float | None]) -> float | None:
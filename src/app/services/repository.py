@@ -1,16 +1,461 @@
 from __future__ import annotations
 
 import sqlite3
-import json
 import logging
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
-from datetime import datetime, timezone
-from urllib.parse import urlparse
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote, urlparse
 
 from app.models import SourceMeasurement, StationCatalogItem
+from app.utils.serialization import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
+# Pooled connections keep prepared statements across calls, keyed by SQL text. Room for every
+# repository query plus one multi-VALUES variant per distinct trailing chunk size.
+_CACHED_STATEMENTS = 256
+
+# Upper bound on rows per multi-VALUES INSERT. Each chunk is further capped by the connection's bind
+# variable limit, which is only 999 on SQLite builds before 3.32 (200 rows x 11 columns needs 2200).
+_MULTI_VALUES_CHUNK_ROWS = 200
+
+# Idle read-only connections kept for reuse. Readers beyond this many at once get a connection of their
+# own that is closed on return, so short-lived worker threads never accumulate open connections.
+_READ_POOL_SIZE = 8
+
+# Catalog reads are memoized per repository; other processes' upserts become visible within this TTL.
+_CATALOG_CACHE_TTL_SECONDS = 60.0
+
+# Station ids come from request URLs, so the per-item cache is an LRU and only holds found stations.
+_CATALOG_ITEM_CACHE_SIZE = 256
+
+# Bumped whenever ``_initialize`` has to migrate existing tables (stored in ``PRAGMA user_version``).
+# Databases already at this version skip the migration and column-backfill probes entirely, so new
+# ``_ensure_*`` columns must come with a version bump.
+_SCHEMA_VERSION = 3
+
+# windows_json payloads above this size are stored as a zlib-compressed BLOB in the same column
+# (SQLite keeps BLOBs as-is under TEXT affinity); smaller ones stay plain TEXT.
+_WINDOWS_JSON_COMPRESS_MIN_BYTES = 1024
+
+# Decoded query jobs kept in memory, revalidated against updated_at_utc (epoch microseconds) on every read.
+# The upsert advances updated_at_utc by at least 1 us per write, so writes in the same microsecond or after
+# a wall-clock step backwards still invalidate the cached copy.
+_ANALYSIS_QUERY_JOB_CACHE_SIZE = 256
+
+# Stored values of the JSON list columns that decode to [] without calling the parser.
+_EMPTY_JSON_ARRAYS = frozenset((None, "", "[]"))
+
+# Per-connection settings; journal_mode = WAL is persistent and applied once by _SCHEMA_SQL.
+# NORMAL sync is durable under WAL except for the last commits on power loss, which is fine for a cache.
+_CONNECTION_PRAGMAS_SQL = """
+    PRAGMA busy_timeout = 5000;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -20000;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# measurements and fetch_windows are WITHOUT ROWID tables clustered on their primary keys, so the
+# range scans in get_measurements/has_*_fetch_window read only the key b-tree (no heap lookups)
+# without a second covering index duplicating every row.
+_MEASUREMENTS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS measurements (
+        station_id TEXT NOT NULL,
+        station_name TEXT NOT NULL,
+        measured_at_utc INTEGER NOT NULL,
+        temperature_c REAL,
+        pressure_hpa REAL,
+        speed_mps REAL,
+        direction_deg REAL,
+        latitude REAL,
+        longitude REAL,
+        altitude_m REAL,
+        fetched_at_utc INTEGER NOT NULL,
+        PRIMARY KEY (station_id, measured_at_utc)
+    ) WITHOUT ROWID
+"""
+
+_FETCH_WINDOWS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS fetch_windows (
+        station_id TEXT NOT NULL,
+        start_utc INTEGER NOT NULL,
+        end_utc INTEGER NOT NULL,
+        fetched_at_utc INTEGER NOT NULL,
+        direction_checked INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (station_id, start_utc, end_utc)
+    ) WITHOUT ROWID
+"""
+
+_STATION_CATALOG_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS station_catalog (
+        station_id TEXT NOT NULL PRIMARY KEY,
+        station_name TEXT NOT NULL,
+        province TEXT,
+        latitude REAL,
+        longitude REAL,
+        altitude_m REAL,
+        data_endpoint TEXT NOT NULL DEFAULT 'valores-climatologicos-inventario',
+        is_antarctic_station INTEGER NOT NULL DEFAULT 0,
+        fetched_at_utc INTEGER NOT NULL
+    )
+"""
+
+_ANALYSIS_QUERY_JOBS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS analysis_query_jobs (
+        job_id TEXT PRIMARY KEY,
+        station_id TEXT NOT NULL,
+        requested_start_utc TEXT NOT NULL,
+        effective_end_utc TEXT NOT NULL,
+        history_start_utc TEXT NOT NULL,
+        timezone_input TEXT NOT NULL,
+        aggregation TEXT NOT NULL,
+        selected_types_json TEXT NOT NULL,
+        playback_step TEXT NOT NULL,
+        status TEXT NOT NULL,
+        total_windows INTEGER NOT NULL,
+        cached_windows INTEGER NOT NULL,
+        missing_windows INTEGER NOT NULL,
+        completed_windows INTEGER NOT NULL,
+        total_api_calls_planned INTEGER NOT NULL,
+        completed_api_calls INTEGER NOT NULL,
+        frames_planned INTEGER NOT NULL,
+        frames_ready INTEGER NOT NULL,
+        playback_ready INTEGER NOT NULL DEFAULT 0,
+        message TEXT NOT NULL,
+        error_detail TEXT,
+        windows_json TEXT NOT NULL,
+        created_at_utc INTEGER NOT NULL,
+        updated_at_utc INTEGER NOT NULL
+    )
+"""
+
+# Covering (job_id, updated_at_utc) index pinned by the job cache probe.
+_ANALYSIS_QUERY_JOB_PROBE_INDEX = "idx_analysis_query_jobs_job_updated_at"
+
+# Idempotent bootstrap, run unconditionally in one executescript call; WAL is persistent in the file.
+_SCHEMA_SQL = ";\n".join(
+    (
+        "PRAGMA journal_mode = WAL",
+        _MEASUREMENTS_TABLE_SQL,
+        # The clustered primary key already serves (station_id, measured_at_utc) lookups.
+        "DROP INDEX IF EXISTS idx_measurements_station_datetime",
+        _FETCH_WINDOWS_TABLE_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_fetch_windows_station_fetched_at ON fetch_windows(station_id, fetched_at_utc)",
+        _STATION_CATALOG_TABLE_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_station_catalog_fetched_at ON station_catalog(fetched_at_utc)",
+        _ANALYSIS_QUERY_JOBS_TABLE_SQL,
+        "CREATE INDEX IF NOT EXISTS idx_analysis_query_jobs_updated_at ON analysis_query_jobs(updated_at_utc)",
+        # Covers the updated_at_utc probe in get_analysis_query_job without visiting the wide job row.
+        f"CREATE INDEX IF NOT EXISTS {_ANALYSIS_QUERY_JOB_PROBE_INDEX} ON analysis_query_jobs(job_id, updated_at_utc)",
+    )
+) + ";"
+
+# Tables whose timestamp columns moved from ISO-8601 TEXT to INTEGER epoch seconds in schema v1.
+_EPOCH_TIMESTAMP_TABLES: tuple[tuple[str, str, tuple[str, ...]], ...] = (
+    ("measurements", _MEASUREMENTS_TABLE_SQL, ("measured_at_utc", "fetched_at_utc")),
+    ("fetch_windows", _FETCH_WINDOWS_TABLE_SQL, ("start_utc", "end_utc", "fetched_at_utc")),
+    ("station_catalog", _STATION_CATALOG_TABLE_SQL, ("fetched_at_utc",)),
+)
+
+
+_SQL_UPSERT_MEASUREMENTS_INSERT = """
+    INSERT INTO measurements (
+        station_id, station_name, measured_at_utc,
+        temperature_c, pressure_hpa, speed_mps, direction_deg,
+        latitude, longitude, altitude_m, fetched_at_utc
+    ) VALUES
+"""
+
+_SQL_UPSERT_MEASUREMENTS_CONFLICT = """
+    ON CONFLICT(station_id, measured_at_utc)
+    DO UPDATE SET
+        station_name=excluded.station_name,
+        temperature_c=excluded.temperature_c,
+        pressure_hpa=excluded.pressure_hpa,
+        speed_mps=excluded.speed_mps,
+        direction_deg=excluded.direction_deg,
+        latitude=COALESCE(excluded.latitude, measurements.latitude),
+        longitude=COALESCE(excluded.longitude, measurements.longitude),
+        altitude_m=COALESCE(excluded.altitude_m, measurements.altitude_m),
+        fetched_at_utc=excluded.fetched_at_utc
+"""
+
+_SQL_UPSERT_FETCH_WINDOW = """
+    INSERT INTO fetch_windows (station_id, start_utc, end_utc, fetched_at_utc, direction_checked)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(station_id, start_utc, end_utc)
+    DO UPDATE SET
+        fetched_at_utc = excluded.fetched_at_utc,
+        direction_checked = excluded.direction_checked
+"""
+
+_SQL_HAS_FRESH_FETCH_WINDOW = """
+    SELECT fetched_at_utc
+    FROM fetch_windows
+    WHERE station_id = ?
+      AND start_utc <= ?
+      AND end_utc >= ?
+    ORDER BY fetched_at_utc DESC
+    LIMIT 1
+"""
+
+_SQL_HAS_CACHED_FETCH_WINDOW = """
+    SELECT 1
+    FROM fetch_windows
+    WHERE station_id = ?
+      AND start_utc <= ?
+      AND end_utc >= ?
+    LIMIT 1
+"""
+
+_SQL_IS_FETCH_WINDOW_DIRECTION_CHECKED = """
+    SELECT direction_checked
+    FROM fetch_windows
+    WHERE station_id = ?
+      AND start_utc <= ?
+      AND end_utc >= ?
+    ORDER BY fetched_at_utc DESC, direction_checked DESC
+    LIMIT 1
+"""
+
+_SQL_MARK_FETCH_WINDOW_DIRECTION_CHECKED = """
+    INSERT INTO fetch_windows (station_id, start_utc, end_utc, fetched_at_utc, direction_checked)
+    VALUES (
+        ?, ?, ?,
+        COALESCE(
+            (
+                SELECT MAX(fetched_at_utc)
+                FROM fetch_windows
+                WHERE station_id = ?
+                  AND start_utc <= ?
+                  AND end_utc >= ?
+            ),
+            ?
+        ),
+        1
+    )
+    ON CONFLICT(station_id, start_utc, end_utc)
+    DO UPDATE SET direction_checked = 1
+"""
+
+_SQL_GET_MEASUREMENTS = """
+    SELECT station_name, measured_at_utc, temperature_c, pressure_hpa, speed_mps,
+           direction_deg, latitude, longitude, altitude_m
+    FROM measurements
+    WHERE station_id = ?
+      AND measured_at_utc BETWEEN ? AND ?
+    ORDER BY measured_at_utc ASC
+"""
+
+_SQL_UPSERT_STATION_CATALOG_INSERT = """
+    INSERT INTO station_catalog (
+        station_id, station_name, province, latitude, longitude, altitude_m,
+        data_endpoint, is_antarctic_station, fetched_at_utc
+    ) VALUES
+"""
+
+_SQL_UPSERT_STATION_CATALOG_CONFLICT = """
+    ON CONFLICT(station_id)
+    DO UPDATE SET
+        station_name=excluded.station_name,
+        province=excluded.province,
+        latitude=excluded.latitude,
+        longitude=excluded.longitude,
+        altitude_m=excluded.altitude_m,
+        data_endpoint=excluded.data_endpoint,
+        is_antarctic_station=excluded.is_antarctic_station,
+        fetched_at_utc=excluded.fetched_at_utc
+"""
+
+_SQL_STATION_CATALOG_LAST_FETCHED_AT = """
+    SELECT MAX(fetched_at_utc) AS last_fetched_at_utc
+    FROM station_catalog
+"""
+
+_SQL_GET_STATION_CATALOG = """
+    SELECT station_id, station_name, province, latitude, longitude, altitude_m,
+           data_endpoint, is_antarctic_station
+    FROM station_catalog
+    ORDER BY station_name ASC
+"""
+
+_SQL_GET_STATION_CATALOG_ITEM = """
+    SELECT station_id, station_name, province, latitude, longitude, altitude_m,
+           data_endpoint, is_antarctic_station
+    FROM station_catalog
+    WHERE station_id = ?
+    LIMIT 1
+"""
+
+_SQL_GET_LATEST_MEASUREMENT_TIMESTAMP = """
+    SELECT MAX(measured_at_utc) AS latest_measured_at_utc
+    FROM measurements
+    WHERE station_id = ?
+"""
+
+_SQL_GET_LATEST_MEASUREMENT = """
+    SELECT station_name, measured_at_utc, temperature_c, pressure_hpa, speed_mps,
+           direction_deg, latitude, longitude, altitude_m
+    FROM measurements
+    WHERE station_id = ?
+    ORDER BY measured_at_utc DESC
+    LIMIT 1
+"""
+
+_SQL_UPSERT_ANALYSIS_QUERY_JOB = """
+    INSERT INTO analysis_query_jobs (
+        job_id, station_id, requested_start_utc, effective_end_utc, history_start_utc,
+        timezone_input, aggregation, selected_types_json, playback_step, status,
+        total_windows, cached_windows, missing_windows, completed_windows,
+        total_api_calls_planned, completed_api_calls, frames_planned, frames_ready,
+        playback_ready, message, error_detail, windows_json, created_at_utc, updated_at_utc
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(job_id)
+    DO UPDATE SET
+        station_id=excluded.station_id,
+        requested_start_utc=excluded.requested_start_utc,
+        effective_end_utc=excluded.effective_end_utc,
+        history_start_utc=excluded.history_start_utc,
+        timezone_input=excluded.timezone_input,
+        aggregation=excluded.aggregation,
+        selected_types_json=excluded.selected_types_json,
+        playback_step=excluded.playback_step,
+        status=excluded.status,
+        total_windows=excluded.total_windows,
+        cached_windows=excluded.cached_windows,
+        missing_windows=excluded.missing_windows,
+        completed_windows=excluded.completed_windows,
+        total_api_calls_planned=excluded.total_api_calls_planned,
+        completed_api_calls=excluded.completed_api_calls,
+        frames_planned=excluded.frames_planned,
+        frames_ready=excluded.frames_ready,
+        playback_ready=excluded.playback_ready,
+        message=excluded.message,
+        error_detail=excluded.error_detail,
+        windows_json=excluded.windows_json,
+        updated_at_utc=MAX(excluded.updated_at_utc, analysis_query_jobs.updated_at_utc + 1)
+"""
+
+_ANALYSIS_QUERY_JOB_COLUMNS = (
+    "job_id",
+    "station_id",
+    "requested_start_utc",
+    "effective_end_utc",
+    "history_start_utc",
+    "timezone_input",
+    "aggregation",
+    "selected_types_json",
+    "playback_step",
+    "status",
+    "total_windows",
+    "cached_windows",
+    "missing_windows",
+    "completed_windows",
+    "total_api_calls_planned",
+    "completed_api_calls",
+    "frames_planned",
+    "frames_ready",
+    "playback_ready",
+    "message",
+    "error_detail",
+    "windows_json",
+    "created_at_utc",
+    "updated_at_utc",
+)
+
+# Integer progress counters, bound in this order between status and playback_ready.
+_ANALYSIS_QUERY_JOB_COUNTER_COLUMNS = (
+    "total_windows",
+    "cached_windows",
+    "missing_windows",
+    "completed_windows",
+    "total_api_calls_planned",
+    "completed_api_calls",
+    "frames_planned",
+    "frames_ready",
+)
+
+# The planner prefers the unique job_id autoindex, which is not covering; pin the covering one.
+# INDEXED BY fails hard if the index is missing, so the name is shared with _SCHEMA_SQL.
+_SQL_GET_ANALYSIS_QUERY_JOB_UPDATED_AT = f"""
+    SELECT updated_at_utc
+    FROM analysis_query_jobs INDEXED BY {_ANALYSIS_QUERY_JOB_PROBE_INDEX}
+    WHERE job_id = ?
+    LIMIT 1
+"""
+
+_ANALYSIS_QUERY_JOB_UPDATED_AT_INDEX = _ANALYSIS_QUERY_JOB_COLUMNS.index("updated_at_utc")
+
+_SQL_GET_ANALYSIS_QUERY_JOB = f"""
+    SELECT {", ".join(_ANALYSIS_QUERY_JOB_COLUMNS)}
+    FROM analysis_query_jobs
+    WHERE job_id = ?
+    LIMIT 1
+"""
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _from_epoch(value: int) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    # Integer arithmetic on timedeltas: exact, unlike value.timestamp() * 1e6.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _measurement_row_factory(_cursor: sqlite3.Cursor, row: tuple) -> SourceMeasurement:
+    # Column order: station_name, measured_at_utc, temperature_c, pressure_hpa, speed_mps,
+    # direction_deg, latitude, longitude, altitude_m. The table's column types already match the
+    # model fields, so rows skip pydantic validation.
+    return SourceMeasurement.model_construct(
+        station_name=row[0],
+        measured_at_utc=_from_epoch(row[1]),
+        temperature_c=row[2],
+        pressure_hpa=row[3],
+        speed_mps=row[4],
+        direction_deg=row[5],
+        latitude=row[6],
+        longitude=row[7],
+        altitude_m=row[8],
+    )
+
+
+def _station_catalog_row_factory(_cursor: sqlite3.Cursor, row: tuple) -> StationCatalogItem:
+    # Column order: station_id, station_name, province, latitude, longitude, altitude_m,
+    # data_endpoint, is_antarctic_station.
+    return StationCatalogItem.model_construct(
+        stationId=row[0],
+        stationName=row[1],
+        province=row[2],
+        latitude=row[3],
+        longitude=row[4],
+        altitude=row[5],
+        dataEndpoint=row[6],
+        isAntarcticStation=bool(row[7]),
+    )
+
 
 class SQLiteRepository:
     def __init__(self, database_url: str) -> None:
@@ -36,6 +481,22 @@ class SQLiteRepository:
 
             self.db_path = normalized_path or "aemet_cache.db"
 
+        # A bounded pool of readers plus one writer serialized by a lock.
+        self._read_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=_READ_POOL_SIZE)
+        self._read_connections: set[sqlite3.Connection] = set()
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._write_conn: sqlite3.Connection | None = None
+        # The catalog only changes through upsert_station_catalog, which invalidates these.
+        self._catalog_item_cache: OrderedDict[str, tuple[float, StationCatalogItem]] = OrderedDict()
+        self._catalog_cache_lock = threading.Lock()
+        # Bumped by every invalidation; a load that started before the bump must not be cached.
+        self._catalog_generation = 0
+        self._catalog_all_cache: tuple[float, list[StationCatalogItem]] | None = None
+        # Polled job status: keyed by job_id, valid while the stored updated_at_utc is unchanged.
+        self._job_cache: OrderedDict[str, tuple[int, dict[str, object]]] = OrderedDict()
+        self._job_cache_lock = threading.Lock()
+
         logger.info("Initializing SQLite repository path=%s", self.db_path)
         try:
             self._initialize()
@@ -49,126 +510,188 @@ class SQLiteRepository:
                 str(exc),
                 fallback_path,
             )
+            self.close()
             self.db_path = fallback_path
             self._initialize()
 
-    def _new_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    def _new_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            # mode=ro is enforced when the file is opened, so reads skip a per-call query_only PRAGMA.
+            conn = sqlite3.connect(
+                f"file:{quote(self.db_path)}?mode=ro",
+                uri=True,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+        else:
+            # Autocommit mode: _write_connection issues BEGIN IMMEDIATE / COMMIT itself.
+            conn = sqlite3.connect(
+                self.db_path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS,
+                isolation_level=None,
+            )
         conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.executescript(_CONNECTION_PRAGMAS_SQL)
         return conn
 
     @contextmanager
     def _read_connection(self):
-        conn = self._new_connection()
-        conn.execute("PRAGMA query_only = ON")
+        if self.db_path == ":memory:":
+            # Every :memory: connection is a separate database; reads must share the writer.
+            with self._write_connection() as conn:
+                yield conn
+            return
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection(read_only=True)
+            with self._pool_lock:
+                self._read_connections.add(conn)
         try:
             yield conn
         finally:
-            conn.close()
+            self._release_read_connection(conn)
+
+    def _release_read_connection(self, conn: sqlite3.Connection) -> None:
+        with self._pool_lock:
+            if conn not in self._read_connections:
+                # close() ran while this connection was checked out.
+                return
+            try:
+                self._read_pool.put_nowait(conn)
+                return
+            except queue.Full:
+                self._read_connections.discard(conn)
+        conn.close()
 
     @contextmanager
     def _write_connection(self):
-        conn = self._new_connection()
-        try:
-            yield conn
-        finally:
+        with self._write_lock:
+            if self._write_conn is None:
+                self._write_conn = self._new_connection()
+            conn = self._write_conn
+            # Claim the write lock up front: a deferred transaction upgrading from a read lock
+            # can fail with SQLITE_BUSY when another process writes in between.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close pooled connections; later calls transparently reopen them."""
+        with self._pool_lock:
+            read_connections, self._read_connections = self._read_connections, set()
+            self._read_pool = queue.LifoQueue(maxsize=_READ_POOL_SIZE)
+        for conn in read_connections:
             conn.close()
+        with self._write_lock:
+            if self._write_conn is not None:
+                try:
+                    # Refresh planner statistics (ANALYZE) only where this process's queries need them.
+                    self._write_conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+                self._write_conn.close()
+                self._write_conn = None
 
     def _initialize(self) -> None:
         with self._write_connection() as conn:
-            conn.execute("PRAGMA journal_mode = WAL")
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS measurements (
-                    station_id TEXT NOT NULL,
-                    station_name TEXT NOT NULL,
-                    measured_at_utc TEXT NOT NULL,
-                    temperature_c REAL,
-                    pressure_hpa REAL,
-                    speed_mps REAL,
-                    direction_deg REAL,
-                    latitude REAL,
-                    longitude REAL,
-                    altitude_m REAL,
-                    fetched_at_utc TEXT NOT NULL,
-                    PRIMARY KEY (station_id, measured_at_utc)
-                )
-                """
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_measurements_station_datetime ON measurements(station_id, measured_at_utc)"
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS fetch_windows (
-                    station_id TEXT NOT NULL,
-                    start_utc TEXT NOT NULL,
-                    end_utc TEXT NOT NULL,
-                    fetched_at_utc TEXT NOT NULL,
-                    direction_checked INTEGER NOT NULL DEFAULT 0,
-                    PRIMARY KEY (station_id, start_utc, end_utc)
-                )
-                """
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_fetch_windows_station_fetched_at ON fetch_windows(station_id, fetched_at_utc)"
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS station_catalog (
-                    station_id TEXT NOT NULL PRIMARY KEY,
-                    station_name TEXT NOT NULL,
-                    province TEXT,
-                    latitude REAL,
-                    longitude REAL,
-                    altitude_m REAL,
-                    data_endpoint TEXT NOT NULL DEFAULT 'valores-climatologicos-inventario',
-                    is_antarctic_station INTEGER NOT NULL DEFAULT 0,
-                    fetched_at_utc TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_station_catalog_fetched_at ON station_catalog(fetched_at_utc)"
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS analysis_query_jobs (
-                    job_id TEXT PRIMARY KEY,
-                    station_id TEXT NOT NULL,
-                    requested_start_utc TEXT NOT NULL,
-                    effective_end_utc TEXT NOT NULL,
-                    history_start_utc TEXT NOT NULL,
-                    timezone_input TEXT NOT NULL,
-                    aggregation TEXT NOT NULL,
-                    selected_types_json TEXT NOT NULL,
-                    playback_step TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    total_windows INTEGER NOT NULL,
-                    cached_windows INTEGER NOT NULL,
-                    missing_windows INTEGER NOT NULL,
-                    completed_windows INTEGER NOT NULL,
-                    total_api_calls_planned INTEGER NOT NULL,
-                    completed_api_calls INTEGER NOT NULL,
-                    frames_planned INTEGER NOT NULL,
-                    frames_ready INTEGER NOT NULL,
-                    playback_ready INTEGER NOT NULL DEFAULT 0,
-                    message TEXT NOT NULL,
-                    error_detail TEXT,
-                    windows_json TEXT NOT NULL,
-                    created_at_utc TEXT NOT NULL,
-                    updated_at_utc TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_analysis_query_jobs_updated_at ON analysis_query_jobs(updated_at_utc)"
-            )
+            # executescript commits the open transaction first, so re-open one for the migrations.
+            conn.executescript(_SCHEMA_SQL)
+            conn.execute("BEGIN IMMEDIATE")
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if schema_version >= _SCHEMA_VERSION:
+                # Warm start: the column backfills below predate the current schema version.
+                return
             self._ensure_columns(conn)
             self._ensure_station_catalog_columns(conn)
             self._ensure_fetch_windows_columns(conn)
-            conn.commit()
+            if schema_version < 1:
+                self._migrate_epoch_timestamps(conn)
+            if schema_version < 2:
+                self._migrate_clustered_tables(conn)
+            if schema_version < 3:
+                self._migrate_query_job_timestamps(conn)
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            # executescript commits the migration first; rebuilt tables lost their indexes with the legacy copy.
+            conn.executescript(_SCHEMA_SQL)
+
+    @staticmethod
+    def _migrate_epoch_timestamps(conn: sqlite3.Connection) -> None:
+        # Column types cannot be altered in place: rebuild each legacy TEXT table and convert the
+        # ISO strings with strftime('%s', ...). Rows whose key timestamps do not parse are dropped.
+        for table, table_sql, timestamp_columns in _EPOCH_TIMESTAMP_TABLES:
+            table_info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            column_types = {row["name"]: str(row["type"]).upper() for row in table_info}
+            if column_types.get(timestamp_columns[0]) != "TEXT":
+                continue
+            logger.info("Migrating SQLite table=%s timestamps to epoch seconds", table)
+            columns = [row["name"] for row in table_info]
+            select_exprs = []
+            for column in columns:
+                if column == "fetched_at_utc":
+                    select_exprs.append("COALESCE(CAST(strftime('%s', fetched_at_utc) AS INTEGER), 0)")
+                elif column in timestamp_columns:
+                    select_exprs.append(f"CAST(strftime('%s', {column}) AS INTEGER)")
+                else:
+                    select_exprs.append(column)
+            key_columns = [column for column in timestamp_columns if column != "fetched_at_utc"]
+            where_clause = " AND ".join(f"strftime('%s', {column}) IS NOT NULL" for column in key_columns) or "1"
+            SQLiteRepository._rebuild_table(conn, table, table_sql, columns, select_exprs, where_clause)
+
+    @staticmethod
+    def _migrate_clustered_tables(conn: sqlite3.Connection) -> None:
+        for table, table_sql in (("measurements", _MEASUREMENTS_TABLE_SQL), ("fetch_windows", _FETCH_WINDOWS_TABLE_SQL)):
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+            if row is None or "WITHOUT ROWID" in str(row["sql"]).upper():
+                continue
+            logger.info("Migrating SQLite table=%s to a clustered WITHOUT ROWID layout", table)
+            columns = [info["name"] for info in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+            SQLiteRepository._rebuild_table(conn, table, table_sql, columns, columns)
+
+    @staticmethod
+    def _migrate_query_job_timestamps(conn: sqlite3.Connection) -> None:
+        # Job timestamps moved to epoch microseconds; legacy ISO strings keep whole-second precision.
+        table_info = conn.execute("PRAGMA table_info(analysis_query_jobs)").fetchall()
+        column_types = {row["name"]: str(row["type"]).upper() for row in table_info}
+        if column_types.get("updated_at_utc") != "TEXT":
+            return
+        logger.info("Migrating SQLite table=analysis_query_jobs timestamps to epoch microseconds")
+        columns = [row["name"] for row in table_info]
+        select_exprs = [
+            f"COALESCE(CAST(strftime('%s', {column}) AS INTEGER), 0) * 1000000"
+            if column in ("created_at_utc", "updated_at_utc")
+            else column
+            for column in columns
+        ]
+        SQLiteRepository._rebuild_table(conn, "analysis_query_jobs", _ANALYSIS_QUERY_JOBS_TABLE_SQL, columns, select_exprs)
+
+    @staticmethod
+    def _rebuild_table(
+        conn: sqlite3.Connection,
+        table: str,
+        table_sql: str,
+        columns: list[str],
+        select_exprs: list[str],
+        where_clause: str = "1",
+    ) -> None:
+        legacy_table = f"{table}_legacy"
+        conn.execute(f"DROP TABLE IF EXISTS {legacy_table}")
+        conn.execute(f"ALTER TABLE {table} RENAME TO {legacy_table}")
+        conn.execute(table_sql)
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(select_exprs)} FROM {legacy_table} WHERE {where_clause}"
+        )
+        conn.execute(f"DROP TABLE {legacy_table}")
 
     @staticmethod
     def _ensure_columns(conn: sqlite3.Connection) -> None:
@@ -209,6 +732,27 @@ class SQLiteRepository:
             if column not in existing_columns:
                 conn.execute(ddl)
 
+    @staticmethod
+    def _execute_multi_values(
+        conn: sqlite3.Connection,
+        insert_sql: str,
+        conflict_sql: str,
+        rows: list[tuple[object, ...]],
+    ) -> None:
+        # One multi-row INSERT per chunk is parsed and planned once, instead of once per row.
+        if not rows:
+            return
+        max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        chunk_rows = max(1, min(_MULTI_VALUES_CHUNK_ROWS, max_variables // len(rows[0])))
+        for offset in range(0, len(rows), chunk_rows):
+            chunk = rows[offset: offset + chunk_rows]
+            row_placeholders = "(" + ", ".join("?" * len(chunk[0])) + ")"
+            values_sql = ", ".join([row_placeholders] * len(chunk))
+            conn.execute(
+                f"{insert_sql} {values_sql} {conflict_sql}",
+                [value for row in chunk for value in row],
+            )
+
     def upsert_measurements(
         self,
         station_id: str,
@@ -216,40 +760,25 @@ class SQLiteRepository:
         start_utc: datetime,
         end_utc: datetime,
     ) -> None:
-        now_utc = datetime.utcnow().isoformat()
+        now_utc = _to_epoch(datetime.now(timezone.utc))
         direction_checked = 1
         logger.debug(
             "Upsert measurements station=%s rows=%d start=%s end=%s",
             station_id,
             len(rows),
-            start_utc.isoformat(),
-            end_utc.isoformat(),
+            start_utc,
+            end_utc,
         )
         with self._write_connection() as conn:
-            conn.executemany(
-                """
-                INSERT INTO measurements (
-                    station_id, station_name, measured_at_utc,
-                    temperature_c, pressure_hpa, speed_mps, direction_deg,
-                    latitude, longitude, altitude_m, fetched_at_utc
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(station_id, measured_at_utc)
-                DO UPDATE SET
-                    station_name=excluded.station_name,
-                    temperature_c=excluded.temperature_c,
-                    pressure_hpa=excluded.pressure_hpa,
-                    speed_mps=excluded.speed_mps,
-                    direction_deg=excluded.direction_deg,
-                    latitude=COALESCE(excluded.latitude, measurements.latitude),
-                    longitude=COALESCE(excluded.longitude, measurements.longitude),
-                    altitude_m=COALESCE(excluded.altitude_m, measurements.altitude_m),
-                    fetched_at_utc=excluded.fetched_at_utc
-                """,
+            self._execute_multi_values(
+                conn,
+                _SQL_UPSERT_MEASUREMENTS_INSERT,
+                _SQL_UPSERT_MEASUREMENTS_CONFLICT,
                 [
                     (
                         station_id,
                         row.station_name,
-                        row.measured_at_utc.isoformat(),
+                        _to_epoch(row.measured_at_utc),
                         row.temperature_c,
                         row.pressure_hpa,
                         row.speed_mps,
@@ -263,17 +792,9 @@ class SQLiteRepository:
                 ],
             )
             conn.execute(
-                """
-                INSERT INTO fetch_windows (station_id, start_utc, end_utc, fetched_at_utc, direction_checked)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(station_id, start_utc, end_utc)
-                DO UPDATE SET
-                    fetched_at_utc = excluded.fetched_at_utc,
-                    direction_checked = excluded.direction_checked
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat(), now_utc, direction_checked),
+                _SQL_UPSERT_FETCH_WINDOW,
+                (station_id, _to_epoch(start_utc), _to_epoch(end_utc), now_utc, direction_checked),
             )
-            conn.commit()
 
     def has_fresh_fetch_window(
         self,
@@ -284,23 +805,12 @@ class SQLiteRepository:
     ) -> bool:
         with self._read_connection() as conn:
             row = conn.execute(
-                """
-                SELECT fetched_at_utc
-                FROM fetch_windows
-                WHERE station_id = ?
-                  AND start_utc <= ?
-                  AND end_utc >= ?
-                ORDER BY fetched_at_utc DESC
-                LIMIT 1
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat()),
+                _SQL_HAS_FRESH_FETCH_WINDOW,
+                (station_id, _to_epoch(start_utc), _to_epoch(end_utc)),
             ).fetchone()
         if row is None:
             return False
-        fetched_at = datetime.fromisoformat(row["fetched_at_utc"])
-        if fetched_at.tzinfo is None:
-            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
-        return fetched_at >= min_fetched_at_utc
+        return _from_epoch(row["fetched_at_utc"]) >= min_fetched_at_utc
 
     def has_cached_fetch_window(
         self,
@@ -310,15 +820,8 @@ class SQLiteRepository:
     ) -> bool:
         with self._read_connection() as conn:
             row = conn.execute(
-                """
-                SELECT 1
-                FROM fetch_windows
-                WHERE station_id = ?
-                  AND start_utc <= ?
-                  AND end_utc >= ?
-                LIMIT 1
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat()),
+                _SQL_HAS_CACHED_FETCH_WINDOW,
+                (station_id, _to_epoch(start_utc), _to_epoch(end_utc)),
             ).fetchone()
         return row is not None
 
@@ -330,16 +833,8 @@ class SQLiteRepository:
     ) -> bool:
         with self._read_connection() as conn:
             row = conn.execute(
-                """
-                SELECT direction_checked
-                FROM fetch_windows
-                WHERE station_id = ?
-                  AND start_utc <= ?
-                  AND end_utc >= ?
-                ORDER BY fetched_at_utc DESC
-                LIMIT 1
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat()),
+                _SQL_IS_FETCH_WINDOW_DIRECTION_CHECKED,
+                (station_id, _to_epoch(start_utc), _to_epoch(end_utc)),
             ).fetchone()
         if row is None or row["direction_checked"] is None:
             return False
@@ -351,92 +846,37 @@ class SQLiteRepository:
         start_utc: datetime,
         end_utc: datetime,
     ) -> None:
-        now_utc = datetime.utcnow().isoformat()
+        now_utc = _to_epoch(datetime.now(timezone.utc))
+        start_epoch = _to_epoch(start_utc)
+        end_epoch = _to_epoch(end_utc)
         with self._write_connection() as conn:
+            # fetched_at_utc is inherited from the covering window (if any) so that flagging a
+            # window never makes stale cached data look fresh to has_fresh_fetch_window.
             conn.execute(
-                """
-                UPDATE fetch_windows
-                SET direction_checked = 1
-                WHERE station_id = ?
-                  AND start_utc <= ?
-                  AND end_utc >= ?
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat()),
-            )
-            conn.execute(
-                """
-                INSERT INTO fetch_windows (station_id, start_utc, end_utc, fetched_at_utc, direction_checked)
-                SELECT ?, ?, ?, ?, 1
-                WHERE NOT EXISTS (
-                    SELECT 1
-                    FROM fetch_windows
-                    WHERE station_id = ?
-                      AND start_utc <= ?
-                      AND end_utc >= ?
-                )
-                """,
-                (
-                    station_id,
-                    start_utc.isoformat(),
-                    end_utc.isoformat(),
-                    now_utc,
-                    station_id,
-                    start_utc.isoformat(),
-                    end_utc.isoformat(),
-                ),
+                _SQL_MARK_FETCH_WINDOW_DIRECTION_CHECKED,
+                (station_id, start_epoch, end_epoch, station_id, start_epoch, end_epoch, now_utc),
             )
-            conn.commit()
 
     def get_measurements(self, station_id: str, start_utc: datetime, end_utc: datetime) -> list[SourceMeasurement]:
+        # The cursor's row factory builds models as rows are stepped, so raw rows are never
+        # materialized as a second list.
         with self._read_connection() as conn:
-            result = conn.execute(
-                """
-                SELECT station_name, measured_at_utc, temperature_c, pressure_hpa, speed_mps,
-                       direction_deg, latitude, longitude, altitude_m
-                FROM measurements
-                WHERE station_id = ?
-                  AND measured_at_utc >= ?
-                  AND measured_at_utc <= ?
-                ORDER BY measured_at_utc ASC
-                """,
-                (station_id, start_utc.isoformat(), end_utc.isoformat()),
+            cursor = conn.cursor()
+            cursor.row_factory = _measurement_row_factory
+            return cursor.execute(
+                _SQL_GET_MEASUREMENTS,
+                (station_id, _to_epoch(start_utc), _to_epoch(end_utc)),
             ).fetchall()
-        return [
-            SourceMeasurement(
-                station_name=row["station_name"],
-                measured_at_utc=datetime.fromisoformat(row["measured_at_utc"]),
-                temperature_c=row["temperature_c"],
-                pressure_hpa=row["pressure_hpa"],
-                speed_mps=row["speed_mps"],
-                direction_deg=row["direction_deg"],
-                latitude=row["latitude"],
-                longitude=row["longitude"],
-                altitude_m=row["altitude_m"],
-            )
-            for row in result
-        ]
 
     def upsert_station_catalog(self, rows: list[StationCatalogItem]) -> datetime:
-        now_utc = datetime.now(timezone.utc)
+        now_utc = datetime.now(timezone.utc).replace(microsecond=0)
+        fetched_at_epoch = _to_epoch(now_utc)
         logger.debug("Upsert station catalog rows=%d", len(rows))
         with self._write_connection() as conn:
-            conn.executemany(
-                """
-                INSERT INTO station_catalog (
-                    station_id, station_name, province, latitude, longitude, altitude_m,
-                    data_endpoint, is_antarctic_station, fetched_at_utc
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(station_id)
-                DO UPDATE SET
-                    station_name=excluded.station_name,
-                    province=excluded.province,
-                    latitude=excluded.latitude,
-                    longitude=excluded.longitude,
-                    altitude_m=excluded.altitude_m,
-                    data_endpoint=excluded.data_endpoint,
-                    is_antarctic_station=excluded.is_antarctic_station,
-                    fetched_at_utc=excluded.fetched_at_utc
-                """,
+            self._execute_multi_values(
+                conn,
+                _SQL_UPSERT_STATION_CATALOG_INSERT,
+                _SQL_UPSERT_STATION_CATALOG_CONFLICT,
                 [
                     (
                         row.station_id,
@@ -447,135 +887,98 @@ class SQLiteRepository:
                         row.altitude_m,
                         row.data_endpoint,
                         int(row.is_antarctic_station),
-                        now_utc.isoformat(),
+                        fetched_at_epoch,
                     )
                     for row in rows
                 ],
             )
-            conn.commit()
+        self._invalidate_station_catalog_cache()
         return now_utc
 
     def has_fresh_station_catalog(self, min_fetched_at_utc: datetime) -> bool:
         with self._read_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT MAX(fetched_at_utc) AS last_fetched_at_utc
-                FROM station_catalog
-                """
-            ).fetchone()
+            row = conn.execute(_SQL_STATION_CATALOG_LAST_FETCHED_AT).fetchone()
         if row is None or row["last_fetched_at_utc"] is None:
             return False
-        fetched_at = datetime.fromisoformat(row["last_fetched_at_utc"])
-        if fetched_at.tzinfo is None:
-            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
-        return fetched_at >= min_fetched_at_utc
+        return _from_epoch(row["last_fetched_at_utc"]) >= min_fetched_at_utc
 
     def get_station_catalog_last_fetched_at(self) -> datetime | None:
         with self._read_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT MAX(fetched_at_utc) AS last_fetched_at_utc
-                FROM station_catalog
-                """
-            ).fetchone()
+            row = conn.execute(_SQL_STATION_CATALOG_LAST_FETCHED_AT).fetchone()
         if row is None or row["last_fetched_at_utc"] is None:
             return None
-        return datetime.fromisoformat(row["last_fetched_at_utc"])
+        return _from_epoch(row["last_fetched_at_utc"])
+
+    def _invalidate_station_catalog_cache(self) -> None:
+        with self._catalog_cache_lock:
+            self._catalog_generation += 1
+            self._catalog_item_cache.clear()
+            self._catalog_all_cache = None
 
     def get_station_catalog(self) -> list[StationCatalogItem]:
+        with self._catalog_cache_lock:
+            cached = self._catalog_all_cache
+            generation = self._catalog_generation
+        if cached is not None and time.monotonic() - cached[0] < _CATALOG_CACHE_TTL_SECONDS:
+            return list(cached[1])
+        loaded_at = time.monotonic()
         with self._read_connection() as conn:
-            result = conn.execute(
-                """
-                SELECT station_id, station_name, province, latitude, longitude, altitude_m,
-                       data_endpoint, is_antarctic_station
-                FROM station_catalog
-                ORDER BY station_name ASC
-                """
-            ).fetchall()
-        return [
-            StationCatalogItem(
-                stationId=row["station_id"],
-                stationName=row["station_name"],
-                province=row["province"],
-                latitude=row["latitude"],
-                longitude=row["longitude"],
-                altitude=row["altitude_m"],
-                dataEndpoint=row["data_endpoint"],
-                isAntarcticStation=bool(row["is_antarctic_station"]),
-            )
-            for row in result
-        ]
+            cursor = conn.cursor()
+            cursor.row_factory = _station_catalog_row_factory
+            items = cursor.execute(_SQL_GET_STATION_CATALOG).fetchall()
+        with self._catalog_cache_lock:
+            if generation == self._catalog_generation:
+                self._catalog_all_cache = (loaded_at, items)
+        return list(items)
 
     def get_station_catalog_item(self, station_id: str) -> StationCatalogItem | None:
+        with self._catalog_cache_lock:
+            cached = self._catalog_item_cache.get(station_id)
+            if cached is not None:
+                if time.monotonic() - cached[0] < _CATALOG_CACHE_TTL_SECONDS:
+                    self._catalog_item_cache.move_to_end(station_id)
+                    return cached[1]
+                del self._catalog_item_cache[station_id]
+            generation = self._catalog_generation
+        loaded_at = time.monotonic()
         with self._read_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT station_id, station_name, province, latitude, longitude, altitude_m,
-                       data_endpoint, is_antarctic_station
-                FROM station_catalog
-                WHERE station_id = ?
-                LIMIT 1
-                """,
+            cursor = conn.cursor()
+            cursor.row_factory = _station_catalog_row_factory
+            item = cursor.execute(
+                _SQL_GET_STATION_CATALOG_ITEM,
                 (station_id,),
             ).fetchone()
-
-        if row is None:
-            return None
-
-        return StationCatalogItem(
-            stationId=row["station_id"],
-            stationName=row["station_name"],
-            province=row["province"],
-            latitude=row["latitude"],
-            longitude=row["longitude"],
-            altitude=row["altitude_m"],
-            dataEndpoint=row["data_endpoint"],
-            isAntarcticStation=bool(row["is_antarctic_station"]),
-        )
+        if item is not None:
+            with self._catalog_cache_lock:
+                if generation != self._catalog_generation:
+                    return item
+                self._catalog_item_cache[station_id] = (loaded_at, item)
+                self._catalog_item_cache.move_to_end(station_id)
+                while len(self._catalog_item_cache) > _CATALOG_ITEM_CACHE_SIZE:
+                    self._catalog_item_cache.popitem(last=False)
+        return item
 
     def get_latest_measurement_timestamp(self, station_id: str) -> datetime | None:
         with self._read_connection() as conn:
             row = conn.execute(
-                """
-                SELECT MAX(measured_at_utc) AS latest_measured_at_utc
-                FROM measurements
-                WHERE station_id = ?
-                """,
+                _SQL_GET_LATEST_MEASUREMENT_TIMESTAMP,
                 (station_id,),
             ).fetchone()
         if row is None or row["latest_measured_at_utc"] is None:
             return None
-        return datetime.fromisoformat(row["latest_measured_at_utc"])
+        return _from_epoch(row["latest_measured_at_utc"])
 
     def get_latest_measurement(self, station_id: str) -> SourceMeasurement | None:
         with self._read_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT station_name, measured_at_utc, temperature_c, pressure_hpa, speed_mps,
-                       direction_deg, latitude, longitude, altitude_m
-                FROM measurements
-                WHERE station_id = ?
-                ORDER BY measured_at_utc DESC
-                LIMIT 1
-                """,
+            cursor = conn.cursor()
+            cursor.row_factory = _measurement_row_factory
+            return cursor.execute(
+                _SQL_GET_LATEST_MEASUREMENT,
                 (station_id,),
             ).fetchone()
-        if row is None:
-            return None
-        return SourceMeasurement(
-            station_name=row["station_name"],
-            measured_at_utc=datetime.fromisoformat(row["measured_at_utc"]),
-            temperature_c=row["temperature_c"],
-            pressure_hpa=row["pressure_hpa"],
-            speed_mps=row["speed_mps"],
-            direction_deg=row["direction_deg"],
-            latitude=row["latitude"],
-            longitude=row["longitude"],
-            altitude_m=row["altitude_m"],
-        )
 
     def upsert_analysis_query_job(self, payload: dict[str, object]) -> None:
-        now_utc = datetime.now(timezone.utc).isoformat()
+        now_utc = _to_epoch_us(datetime.now(timezone.utc))
         logger.debug(
             "Upsert query job id=%s status=%s completed_windows=%s total_windows=%s",
             payload.get("job_id"),
@@ -583,49 +986,24 @@ class SQLiteRepository:
             payload.get("completed_windows"),
             payload.get("total_windows"),
         )
-        created_at = str(payload.get("created_at_utc") or now_utc)
+        created_at_value = payload.get("created_at_utc")
+        if isinstance(created_at_value, str):
+            created_at_value = datetime.fromisoformat(created_at_value)
+        created_at = _to_epoch_us(created_at_value) if isinstance(created_at_value, datetime) else now_utc
         windows_json = payload.get("windows_json", "[]")
         if isinstance(windows_json, list):
-            windows_json = json.dumps(windows_json)
+            windows_json = json_dumps(windows_json)
+        windows_value: str | bytes = str(windows_json)
+        windows_bytes = windows_value.encode("utf-8")
+        if len(windows_bytes) >= _WINDOWS_JSON_COMPRESS_MIN_BYTES:
+            windows_value = zlib.compress(windows_bytes, 3)
         types_json = payload.get("selected_types_json", "[]")
         if isinstance(types_json, list):
-            types_json = json.dumps(types_json)
+            types_json = json_dumps(types_json)
 
         with self._write_connection() as conn:
             conn.execute(
-                """
-                INSERT INTO analysis_query_jobs (
-                    job_id, station_id, requested_start_utc, effective_end_utc, history_start_utc,
-                    timezone_input, aggregation, selected_types_json, playback_step, status,
-                    total_windows, cached_windows, missing_windows, completed_windows,
-                    total_api_calls_planned, completed_api_calls, frames_planned, frames_ready,
-                    playback_ready, message, error_detail, windows_json, created_at_utc, updated_at_utc
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(job_id)
-                DO UPDATE SET
-                    station_id=excluded.station_id,
-                    requested_start_utc=excluded.requested_start_utc,
-                    effective_end_utc=excluded.effective_end_utc,
-                    history_start_utc=excluded.history_start_utc,
-                    timezone_input=excluded.timezone_input,
-                    aggregation=excluded.aggregation,
-                    selected_types_json=excluded.selected_types_json,
-                    playback_step=excluded.playback_step,
-                    status=excluded.status,
-                    total_windows=excluded.total_windows,
-                    cached_windows=excluded.cached_windows,
-                    missing_windows=excluded.missing_windows,
-                    completed_windows=excluded.completed_windows,
-                    total_api_calls_planned=excluded.total_api_calls_planned,
-                    completed_api_calls=excluded.completed_api_calls,
-                    frames_planned=excluded.frames_planned,
-                    frames_ready=excluded.frames_ready,
-                    playback_ready=excluded.playback_ready,
-                    message=excluded.message,
-                    error_detail=excluded.error_detail,
-                    windows_json=excluded.windows_json,
-                    updated_at_utc=excluded.updated_at_utc
-                """,
+                _SQL_UPSERT_ANALYSIS_QUERY_JOB,
                 (
                     payload["job_id"],
                     payload["station_id"],
@@ -637,77 +1015,64 @@ class SQLiteRepository:
                     str(types_json),
                     payload["playback_step"],
                     payload["status"],
-                    int(payload.get("total_windows", 0)),
-                    int(payload.get("cached_windows", 0)),
-                    int(payload.get("missing_windows", 0)),
-                    int(payload.get("completed_windows", 0)),
-                    int(payload.get("total_api_calls_planned", 0)),
-                    int(payload.get("completed_api_calls", 0)),
-                    int(payload.get("frames_planned", 0)),
-                    int(payload.get("frames_ready", 0)),
-                    int(1 if payload.get("playback_ready", False) else 0),
+                    *(int(payload.get(key, 0)) for key in _ANALYSIS_QUERY_JOB_COUNTER_COLUMNS),
+                    bool(payload.get("playback_ready", False)),
                     payload.get("message", ""),
                     payload.get("error_detail"),
-                    str(windows_json),
+                    windows_value,
                     created_at,
                     now_utc,
                 ),
             )
-            conn.commit()
 
     def get_analysis_query_job(self, job_id: str) -> dict[str, object] | None:
         with self._read_connection() as conn:
-            row = conn.execute(
-                """
-                SELECT job_id, station_id, requested_start_utc, effective_end_utc, history_start_utc,
-                       timezone_input, aggregation, selected_types_json, playback_step, status,
-                       total_windows, cached_windows, missing_windows, completed_windows,
-                       total_api_calls_planned, completed_api_calls, frames_planned, frames_ready,
-                       playback_ready, message, error_detail, windows_json, created_at_utc, updated_at_utc
-                FROM analysis_query_jobs
-                WHERE job_id = ?
-                LIMIT 1
-                """,
-                (job_id,),
-            ).fetchone()
+            cursor = conn.cursor()
+            # Plain tuples: the result dict is zipped straight from _ANALYSIS_QUERY_JOB_COLUMNS.
+            cursor.row_factory = None
+            probe = cursor.execute(_SQL_GET_ANALYSIS_QUERY_JOB_UPDATED_AT, (job_id,)).fetchone()
+            if probe is None:
+                return None
+            with self._job_cache_lock:
+                cached = self._job_cache.get(job_id)
+            if cached is not None and cached[0] == probe[0]:
+                job = cached[1]
+            else:
+                row = cursor.execute(_SQL_GET_ANALYSIS_QUERY_JOB, (job_id,)).fetchone()
+                if row is None:
+                    return None
+                job = self._decode_analysis_query_job(row)
+                with self._job_cache_lock:
+                    self._job_cache[job_id] = (row[_ANALYSIS_QUERY_JOB_UPDATED_AT_INDEX], job)
+                    self._job_cache.move_to_end(job_id)
+                    while len(self._job_cache) > _ANALYSIS_QUERY_JOB_CACHE_SIZE:
+                        self._job_cache.popitem(last=False)
 
-        if row is None:
-            return None
+        # Callers mutate the payload and its window dicts before upserting it back.
+        result = dict(job)
+        result["selected_types_json"] = list(job["selected_types_json"])  # type: ignore[arg-type]
+        result["windows_json"] = [dict(window) for window in job["windows_json"]]  # type: ignore[attr-defined]
+        return result
 
-        selected_types_raw = row["selected_types_json"] or "[]"
-        windows_raw = row["windows_json"] or "[]"
-        try:
-            selected_types = json.loads(selected_types_raw)
-        except json.JSONDecodeError:
-            selected_types = []
-        try:
-            windows = json.loads(windows_raw)
-        except json.JSONDecodeError:
-            windows = []
-
-        return {
-            "job_id": row["job_id"],
-            "station_id": row["station_id"],
-            "requested_start_utc": row["requested_start_utc"],
-            "effective_end_utc": row["effective_end_utc"],
-            "history_start_utc": row["history_start_utc"],
-            "timezone_input": row["timezone_input"],
-            "aggregation": row["aggregation"],
-            "selected_types_json": selected_types,
-            "playback_step": row["playback_step"],
-            "status": row["status"],
-            "total_windows": row["total_windows"],
-            "cached_windows": row["cached_windows"],
-            "missing_windows": row["missing_windows"],
-            "completed_windows": row["completed_windows"],
-            "total_api_calls_planned": row["total_api_calls_planned"],
-            "completed_api_calls": row["completed_api_calls"],
-            "frames_planned": row["frames_planned"],
-            "frames_ready": row["frames_ready"],
-            "playback_ready": bool(row["playback_ready"]),
-            "message": row["message"],
-            "error_detail": row["error_detail"],
-            "windows_json": windows,
-            "created_at_utc": row["created_at_utc"],
-            "updated_at_utc": row["updated_at_utc"],
-        }
+    @staticmethod
+    def _decode_analysis_query_job(row: tuple) -> dict[str, object]:
+        job = dict(zip(_ANALYSIS_QUERY_JOB_COLUMNS, row))
+        for column in ("selected_types_json", "windows_json"):
+            raw = job[column]
+            if raw in _EMPTY_JSON_ARRAYS:
+                job[column] = []
+                continue
+            try:
+                if isinstance(raw, bytes):
+                    raw = zlib.decompress(raw)
+                decoded = json_loads(raw)
+            except (ValueError, zlib.error):
+                decoded = []
+            job[column] = decoded if isinstance(decoded, list) else []
+        # get_analysis_query_job copies each window dict out of the cache; anything else is malformed.
+        if not all(isinstance(window, dict) for window in job["windows_json"]):  # type: ignore[attr-defined]
+            job["windows_json"] = []
+        job["playback_ready"] = job["playback_ready"] == 1
+        job["created_at_utc"] = _from_epoch_us(job["created_at_utc"]).isoformat()  # type: ignore[arg-type]
+        job["updated_at_utc"] = _from_epoch_us(job["updated_at_utc"]).isoformat()  # type: ignore[arg-type]
+        return job
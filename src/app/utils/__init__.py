@@ -1,4 +1,4 @@
 from app.utils.dates import ensure_max_window_days
+from app.utils.serialization import json_dumps, json_loads
 
-__all__ = ["ensure_max_window_days"]
-
+__all__ = ["ensure_max_window_days", "json_dumps", "json_loads"]
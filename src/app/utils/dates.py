@@ -1,10 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+
+_SECONDS_PER_DAY = 86_400
 
 
 def ensure_max_window_days(start: datetime, end: datetime, max_days: int = 30) -> None:
-    if start >= end:
+    span_seconds = (end - start).total_seconds()
+    if span_seconds <= 0:
         raise ValueError("Start datetime must be before end datetime")
-    max_end = start + timedelta(days=max_days)
-    if end > max_end:
+    if span_seconds > max_days * _SECONDS_PER_DAY:
         raise ValueError(f"Date range cannot exceed {max_days} days from start datetime")
-
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, installed via the [json] extra
+    orjson = None
+
+# orjson would otherwise serialize datetimes and dataclasses that the stdlib rejects, making whether a
+# payload can be stored depend on the optional extra.
+_ORJSON_DUMPS_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+)
+
+
+def json_loads(data: bytes | bytearray | str) -> Any:
+    """Decode JSON with orjson when installed, otherwise the stdlib.
+
+    Both raise a ``json.JSONDecodeError`` (a ``ValueError``) on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value: Any) -> str:
+    """Encode JSON text with orjson when installed, otherwise the stdlib.
+
+    For JSON-native values (dicts with string keys, lists, strings, finite numbers, booleans, None)
+    both paths produce the same compact text with non-ASCII characters left unescaped, and both raise
+    ``TypeError`` for other objects such as datetimes.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=_ORJSON_DUMPS_OPTIONS).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
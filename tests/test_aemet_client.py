@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -17,6 +18,16 @@ class FakeResponse:
     def raise_for_status(self):
         return None
 
+    @property
+    def text(self):
+        if isinstance(self._payload, str):
+            return self._payload
+        return json.dumps(self._payload)
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
     def json(self):
         return self._payload
 
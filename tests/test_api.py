@@ -1,28 +1,35 @@
 from __future__ import annotations
 
+import importlib.util
+from contextlib import contextmanager
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api import dependencies
 from app.api.dependencies import get_auth_service, require_api_user
 from app.main import app, get_service
 from app.models import MeasurementType, OutputMeasurement
 from app.services.auth_service import AuthUser
 
 
+_MEASUREMENT_TEMPLATE = OutputMeasurement.model_construct(
+    stationName="Dummy",
+    datetime=None,
+    temperature=1.0,
+    pressure=2.0,
+    speed=3.0,
+    direction=180.0,
+    latitude=-62.97,
+    longitude=-60.68,
+    altitude=15.0,
+)
+
+
 class FakeService:
     def get_data(self, station, start_local, end_local, aggregation, selected_types):
-        return [
-            OutputMeasurement(
-                stationName="Dummy",
-                datetime=start_local,
-                temperature=1.0,
-                pressure=2.0 if not selected_types or MeasurementType.PRESSURE in selected_types else None,
-                speed=3.0,
-                direction=180.0,
-                latitude=-62.97,
-                longitude=-60.68,
-                altitude=15.0,
-            )
-        ]
+        pressure = 2.0 if not selected_types or MeasurementType.PRESSURE in selected_types else None
+        return [_MEASUREMENT_TEMPLATE.model_copy(update={"datetime_cet": start_local, "pressure_hpa": pressure})]
 
     def get_latest_availability(self, station):
         return {
@@ -334,11 +341,32 @@ class FakeAuthService:
         return AuthUser(username="tester")
 
 
-app.dependency_overrides[get_service] = lambda: FakeService()
+_FAKE_SERVICE = FakeService()
+app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
 app.dependency_overrides[require_api_user] = lambda: AuthUser(username="test")
 client = TestClient(app)
 
 
+def _set_override(dependency, factory):
+    if factory is None:
+        app.dependency_overrides.pop(dependency, None)
+    else:
+        app.dependency_overrides[dependency] = factory
+
+
+@contextmanager
+def _dependency_overrides(overrides):
+    """Temporarily apply ``overrides`` (a ``None`` factory removes one) and restore the previous ones."""
+    previous = {dependency: app.dependency_overrides.get(dependency) for dependency in overrides}
+    for dependency, factory in overrides.items():
+        _set_override(dependency, factory)
+    try:
+        yield
+    finally:
+        for dependency, factory in previous.items():
+            _set_override(dependency, factory)
+
+
 def test_removed_api_surface_is_not_exposed_anymore():
     assert client.get("/api/metadata/available-data").status_code == 404
     assert client.get("/api/metadata/stations").status_code == 404
@@ -378,8 +406,10 @@ def test_export_csv_returns_downloadable_file():
     assert "attachment; filename=" in response.headers["content-disposition"]
     assert response.headers["x-aemet-source"] == "Fuente: AEMET"
     assert response.headers["x-osm-copyright-url"] == "https://www.openstreetmap.org/copyright"
-    assert "stationName,datetime,temperature,pressure,speed,direction,latitude,longitude,altitude" in response.text
-    assert "Dummy" in response.text
+    assert response.text.splitlines() == [
+        "stationName,datetime,temperature,pressure,speed,direction,latitude,longitude,altitude",
+        "Dummy,2024-01-01T00:00:00+00:00,1.0,2.0,3.0,180.0,-62.97,-60.68,15.0",
+    ]
 
 
 def test_export_invalid_timezone_returns_400():
@@ -391,43 +421,38 @@ def test_export_invalid_timezone_returns_400():
 
 
 def test_export_parquet_returns_not_implemented_without_extra_deps():
+    if importlib.util.find_spec("pandas") is not None:
+        pytest.skip("pandas is installed; the 501 fallback is unreachable")
     response = client.get(
         "/api/antarctic/export/fechaini/2024-01-01T00:00:00/fechafin/2024-01-01T01:00:00/estacion/gabriel-de-castilla",
         params={"location": "UTC", "aggregation": "none", "format": "parquet"},
     )
-    assert response.status_code in {200, 501}
-    if response.status_code == 501:
-        assert "Parquet export requires" in response.json()["detail"]
+    assert response.status_code == 501
+    assert "Parquet export requires" in response.json()["detail"]
 
 
 def test_export_runtime_error_returns_502():
-    app.dependency_overrides[get_service] = lambda: ErrorService()
-    try:
+    with _dependency_overrides({get_service: lambda: ErrorService()}):
         response = client.get(
             "/api/antarctic/export/fechaini/2024-01-01T00:00:00/fechafin/2024-01-01T01:00:00/estacion/gabriel-de-castilla",
             params={"location": "UTC", "format": "csv"},
         )
         assert response.status_code == 502
         assert "missing 'datos'" in response.json()["detail"]
-    finally:
-        app.dependency_overrides[get_service] = lambda: FakeService()
 
 
 def test_export_validation_error_returns_400():
-    app.dependency_overrides[get_service] = lambda: ValidationService()
-    try:
+    with _dependency_overrides({get_service: lambda: ValidationService()}):
         response = client.get(
             "/api/antarctic/export/fechaini/2024-01-01T00:00:00/fechafin/2024-01-01T01:00:00/estacion/1234X",
             params={"location": "UTC", "format": "csv"},
         )
         assert response.status_code == 400
         assert "not classified" in response.json()["detail"]
-    finally:
-        app.dependency_overrides[get_service] = lambda: FakeService()
 
 
 def test_latest_availability_endpoint_returns_payload():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     response = client.get("/api/metadata/latest-availability/station/gabriel-de-castilla")
     assert response.status_code == 200
     payload = response.json()
@@ -437,17 +462,14 @@ def test_latest_availability_endpoint_returns_payload():
 
 
 def test_latest_availability_validation_error_returns_400():
-    app.dependency_overrides[get_service] = lambda: ValidationAvailabilityService()
-    try:
+    with _dependency_overrides({get_service: lambda: ValidationAvailabilityService()}):
         response = client.get("/api/metadata/latest-availability/station/1234X")
         assert response.status_code == 400
         assert "not classified" in response.json()["detail"]
-    finally:
-        app.dependency_overrides[get_service] = lambda: FakeService()
 
 
 def test_analysis_bootstrap_endpoint_returns_antarctic_station_profiles():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     response = client.get("/api/analysis/bootstrap")
     assert response.status_code == 200
     payload = response.json()
@@ -458,14 +480,14 @@ def test_analysis_bootstrap_endpoint_returns_antarctic_station_profiles():
 
 
 def test_analysis_bootstrap_sets_request_id_header():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     response = client.get("/api/analysis/bootstrap")
     assert response.status_code == 200
     assert response.headers.get("x-request-id")
 
 
 def test_analysis_query_job_endpoints():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     create = client.post(
         "/api/analysis/query-jobs",
         json={
@@ -491,7 +513,7 @@ def test_analysis_query_job_endpoints():
 
 
 def test_playback_and_timeframe_endpoints():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     playback = client.get(
         "/api/analysis/playback",
         params={
@@ -531,7 +553,7 @@ def test_playback_and_timeframe_endpoints():
 
 
 def test_timeframe_endpoint_comparison_range_validation():
-    app.dependency_overrides[get_service] = lambda: FakeService()
+    app.dependency_overrides[get_service] = lambda: _FAKE_SERVICE
     response = client.get(
         "/api/analysis/timeframes",
         params={
@@ -549,10 +571,9 @@ def test_timeframe_endpoint_comparison_range_validation():
 
 
 def test_jwt_auth_endpoint_and_protected_routes():
-    app.dependency_overrides.pop(require_api_user, None)
-    app.dependency_overrides[get_auth_service] = lambda: FakeAuthService()
-    app.dependency_overrides[get_service] = lambda: FakeService()
-    try:
+    with _dependency_overrides(
+        {require_api_user: None, get_auth_service: lambda: FakeAuthService(), get_service: lambda: _FAKE_SERVICE}
+    ):
         unauthorized = client.get("/api/analysis/bootstrap")
         assert unauthorized.status_code == 401
 
@@ -578,7 +599,15 @@ def test_jwt_auth_endpoint_and_protected_routes():
             headers={"Authorization": f"Bearer {refreshed_payload['accessToken']}"},
         )
         assert authorized_with_refreshed.status_code == 200
-    finally:
-        app.dependency_overrides.pop(get_auth_service, None)
-        app.dependency_overrides[get_service] = lambda: FakeService()
-        app.dependency_overrides[require_api_user] = lambda: AuthUser(username="test")
+
+
+def test_shutdown_does_not_build_an_unused_service(monkeypatch):
+    built = []
+    dependencies.clear_dependency_caches()
+    monkeypatch.setattr(dependencies, "SQLiteRepository", lambda *args, **kwargs: built.append("repository"))
+    monkeypatch.setattr(dependencies, "AemetClient", lambda *args, **kwargs: built.append("aemet_client"))
+
+    with TestClient(app):
+        pass
+
+    assert built == []
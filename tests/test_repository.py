@@ -0,0 +1,468 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.models import SourceMeasurement, StationCatalogItem
+from app.utils import serialization
+from app.services.repository import (
+    _ANALYSIS_QUERY_JOBS_TABLE_SQL,
+    _CATALOG_ITEM_CACHE_SIZE,
+    _READ_POOL_SIZE,
+    _SQL_GET_ANALYSIS_QUERY_JOB_UPDATED_AT,
+    SQLiteRepository,
+)
+
+UTC = ZoneInfo("UTC")
+
+
+def _measurement(measured_at_utc: datetime, speed_mps: float = 5.0) -> SourceMeasurement:
+    return SourceMeasurement(
+        station_name="Station",
+        measured_at_utc=measured_at_utc,
+        temperature_c=-1.0,
+        pressure_hpa=990.0,
+        speed_mps=speed_mps,
+        direction_deg=180.0,
+    )
+
+
+def test_measurements_round_trip_as_aware_utc(tmp_path):
+    repo = SQLiteRepository(f"sqlite:///{tmp_path / 'cache.db'}")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+    repo.upsert_measurements(
+        "89064",
+        [_measurement(datetime(2024, 7, 1, 10, 0, tzinfo=UTC)), _measurement(datetime(2024, 7, 3, tzinfo=UTC))],
+        start,
+        end,
+    )
+
+    rows = repo.get_measurements("89064", start, end)
+
+    assert [row.measured_at_utc for row in rows] == [datetime(2024, 7, 1, 10, 0, tzinfo=UTC)]
+    assert rows[0].measured_at_utc.utcoffset().total_seconds() == 0
+    assert repo.has_cached_fetch_window("89064", start, end)
+    assert repo.get_latest_measurement_timestamp("89064") == datetime(2024, 7, 3, tzinfo=UTC)
+
+
+def test_legacy_iso_text_timestamps_are_migrated_to_epoch(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE measurements (
+            station_id TEXT NOT NULL,
+            station_name TEXT NOT NULL,
+            measured_at_utc TEXT NOT NULL,
+            temperature_c REAL,
+            pressure_hpa REAL,
+            speed_mps REAL,
+            fetched_at_utc TEXT NOT NULL,
+            PRIMARY KEY (station_id, measured_at_utc)
+        );
+        CREATE TABLE fetch_windows (
+            station_id TEXT NOT NULL,
+            start_utc TEXT NOT NULL,
+            end_utc TEXT NOT NULL,
+            fetched_at_utc TEXT NOT NULL,
+            PRIMARY KEY (station_id, start_utc, end_utc)
+        );
+        INSERT INTO measurements VALUES
+            ('89064', 'Station', '2024-07-01T10:00:00+00:00', -1.0, 990.0, 5.0, '2024-07-05T00:00:00');
+        INSERT INTO fetch_windows VALUES
+            ('89064', '2024-07-01T00:00:00+00:00', '2024-07-02T00:00:00+00:00', '2024-07-05T00:00:00');
+        """
+    )
+    conn.close()
+
+    repo = SQLiteRepository(f"sqlite:///{db_path}")
+
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+    rows = repo.get_measurements("89064", start, end)
+    assert [row.measured_at_utc for row in rows] == [datetime(2024, 7, 1, 10, 0, tzinfo=UTC)]
+    assert rows[0].direction_deg is None
+    assert repo.has_fresh_fetch_window("89064", start, end, datetime(2024, 7, 4, tzinfo=UTC))
+    assert not repo.has_fresh_fetch_window("89064", start, end, datetime(2024, 7, 6, tzinfo=UTC))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+        assert conn.execute("SELECT typeof(measured_at_utc) FROM measurements").fetchone()[0] == "integer"
+        table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'measurements'").fetchone()[0]
+        index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+    assert "WITHOUT ROWID" in table_sql
+    assert "idx_fetch_windows_station_fetched_at" in index_names
+
+
+def test_rowid_measurement_tables_are_rebuilt_clustered(tmp_path):
+    db_path = tmp_path / "v1.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE measurements (
+            station_id TEXT NOT NULL,
+            station_name TEXT NOT NULL,
+            measured_at_utc INTEGER NOT NULL,
+            temperature_c REAL,
+            pressure_hpa REAL,
+            speed_mps REAL,
+            direction_deg REAL,
+            latitude REAL,
+            longitude REAL,
+            altitude_m REAL,
+            fetched_at_utc INTEGER NOT NULL,
+            PRIMARY KEY (station_id, measured_at_utc)
+        );
+        CREATE INDEX idx_measurements_station_datetime ON measurements(station_id, measured_at_utc);
+        INSERT INTO measurements VALUES ('89064', 'Station', 1719828000, -1.0, 990.0, 5.0, 90.0, NULL, NULL, NULL, 0);
+        PRAGMA user_version = 1;
+        """
+    )
+    conn.close()
+
+    repo = SQLiteRepository(f"sqlite:///{db_path}")
+
+    latest = repo.get_latest_measurement("89064")
+    assert latest is not None
+    assert latest.measured_at_utc == datetime(2024, 7, 1, 10, 0, tzinfo=UTC)
+    assert latest.direction_deg == 90.0
+    conn = sqlite3.connect(db_path)
+    try:
+        table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'measurements'").fetchone()[0]
+        index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+    assert "WITHOUT ROWID" in table_sql
+    assert "idx_measurements_station_datetime" not in index_names
+
+
+def test_pooled_connections_see_writes_and_reopen_after_close(tmp_path):
+    repo = SQLiteRepository(f"sqlite:///{tmp_path / 'cache.db'}")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+    assert repo.get_latest_measurement_timestamp("89064") is None
+
+    repo.upsert_measurements("89064", [_measurement(datetime(2024, 7, 1, 10, 0, tzinfo=UTC))], start, end)
+    assert repo.get_latest_measurement_timestamp("89064") == datetime(2024, 7, 1, 10, 0, tzinfo=UTC)
+
+    repo.close()
+    assert len(repo.get_measurements("89064", start, end)) == 1
+
+
+def test_measurement_upserts_respect_a_low_bind_variable_limit():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+    rows = [_measurement(datetime(2024, 7, 1, 0, minute, tzinfo=UTC)) for minute in range(60)]
+    rows += [_measurement(datetime(2024, 7, 1, 1, minute, tzinfo=UTC)) for minute in range(60)]
+    # The default on SQLite builds before 3.32.
+    with repo._write_connection() as conn:
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+    repo.upsert_measurements("89064", rows, start, end)
+
+    assert len(repo.get_measurements("89064", start, end)) == 120
+
+
+def test_reads_from_short_lived_threads_reuse_a_bounded_pool(tmp_path):
+    repo = SQLiteRepository(f"sqlite:///{tmp_path / 'cache.db'}")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+    repo.upsert_measurements("89064", [_measurement(datetime(2024, 7, 1, 10, 0, tzinfo=UTC))], start, end)
+    counts = []
+
+    def read():
+        counts.append(len(repo.get_measurements("89064", start, end)))
+
+    threads = [threading.Thread(target=read) for _ in range(_READ_POOL_SIZE * 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == [1] * len(threads)
+    assert len(repo._read_connections) <= _READ_POOL_SIZE
+    repo.close()
+    assert not repo._read_connections
+
+
+def test_memory_database_reads_share_the_writer_connection():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 7, 2, tzinfo=UTC)
+
+    repo.upsert_measurements("89064", [_measurement(datetime(2024, 7, 1, 10, 0, tzinfo=UTC))], start, end)
+
+    assert len(repo.get_measurements("89064", start, end)) == 1
+    assert repo.has_cached_fetch_window("89064", start, end)
+
+
+def test_station_catalog_reads_are_cached_until_upsert():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    item = StationCatalogItem(
+        stationId="89064",
+        stationName="Juan Carlos I",
+        province="ANTARCTIC",
+        latitude=-62.66,
+        longitude=-60.39,
+        altitude=12.0,
+        dataEndpoint="antartida",
+        isAntarcticStation=True,
+    )
+    assert repo.get_station_catalog_item("89064") is None
+    assert repo.get_station_catalog() == []
+
+    repo.upsert_station_catalog([item])
+
+    assert repo.get_station_catalog_item("89064") == item
+    assert repo.get_station_catalog() == [item]
+    with repo._write_connection() as conn:
+        conn.execute("DELETE FROM station_catalog")
+        conn.commit()
+    assert repo.get_station_catalog_item("89064") == item
+
+
+def test_station_catalog_item_cache_is_bounded_and_skips_misses():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    station_ids = [f"{index:05d}" for index in range(_CATALOG_ITEM_CACHE_SIZE + 5)]
+    repo.upsert_station_catalog([StationCatalogItem(stationId=station_id, stationName="Station") for station_id in station_ids])
+
+    for index in range(50):
+        assert repo.get_station_catalog_item(f"bogus-{index}") is None
+    assert not repo._catalog_item_cache
+
+    for station_id in station_ids:
+        assert repo.get_station_catalog_item(station_id).station_id == station_id
+    assert len(repo._catalog_item_cache) == _CATALOG_ITEM_CACHE_SIZE
+    assert station_ids[0] not in repo._catalog_item_cache
+    assert station_ids[-1] in repo._catalog_item_cache
+
+
+def test_station_catalog_loads_overtaken_by_an_upsert_are_not_cached():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    repo.upsert_station_catalog([StationCatalogItem(stationId="89064", stationName="Juan Carlos I")])
+    read_connection = repo._read_connection
+
+    @contextmanager
+    def read_then_invalidate():
+        with read_connection() as conn:
+            yield conn
+        # An upsert from another thread commits between this load and its cache store.
+        repo._invalidate_station_catalog_cache()
+
+    repo._read_connection = read_then_invalidate
+    assert repo.get_station_catalog_item("89064") is not None
+    assert len(repo.get_station_catalog()) == 1
+
+    assert not repo._catalog_item_cache
+    assert repo._catalog_all_cache is None
+
+
+def test_mark_direction_checked_flags_window_without_refreshing_it(tmp_path):
+    repo = SQLiteRepository(f"sqlite:///{tmp_path / 'cache.db'}")
+    start = datetime(2024, 7, 1, tzinfo=UTC)
+    end = datetime(2024, 8, 1, tzinfo=UTC)
+    inner_start = datetime(2024, 7, 10, tzinfo=UTC)
+    repo.upsert_measurements("89064", [], start, end)
+    with repo._write_connection() as conn:
+        conn.execute("UPDATE fetch_windows SET direction_checked = 0, fetched_at_utc = 0")
+        conn.commit()
+
+    assert not repo.is_fetch_window_direction_checked("89064", inner_start, end)
+    repo.mark_fetch_window_direction_checked("89064", inner_start, end)
+    repo.mark_fetch_window_direction_checked("89064", inner_start, end)
+
+    assert repo.is_fetch_window_direction_checked("89064", inner_start, end)
+    assert not repo.has_fresh_fetch_window("89064", inner_start, end, datetime(2024, 1, 1, tzinfo=UTC))
+
+
+def _query_job_payload(**overrides):
+    payload = {
+        "job_id": "job-1",
+        "station_id": "89064",
+        "requested_start_utc": "2024-07-01T00:00:00+00:00",
+        "effective_end_utc": "2024-08-01T00:00:00+00:00",
+        "history_start_utc": "2022-07-01T00:00:00+00:00",
+        "timezone_input": "UTC",
+        "aggregation": "none",
+        "selected_types_json": ["speed", "direction"],
+        "playback_step": "1h",
+        "status": "running",
+        "total_windows": 2,
+        "cached_windows": 1,
+        "missing_windows": 1,
+        "completed_windows": 1,
+        "total_api_calls_planned": 1,
+        "completed_api_calls": 0,
+        "frames_planned": 10,
+        "frames_ready": 0,
+        "playback_ready": False,
+        "message": "Fetching",
+        "error_detail": None,
+        "windows_json": [
+            {"start_utc": "2024-07-01T00:00:00+00:00", "end_utc": "2024-08-01T00:00:00+00:00", "status": "cached"},
+            {"start_utc": "2024-08-01T00:00:00+00:00", "end_utc": "2024-09-01T00:00:00+00:00", "status": "pending"},
+        ],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_analysis_query_job_round_trip():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    assert repo.get_analysis_query_job("job-1") is None
+
+    repo.upsert_analysis_query_job(_query_job_payload())
+    created = repo.get_analysis_query_job("job-1")
+    repo.upsert_analysis_query_job(_query_job_payload(status="complete", completed_windows=2, playback_ready=True))
+    updated = repo.get_analysis_query_job("job-1")
+
+    assert created["selected_types_json"] == ["speed", "direction"]
+    assert created["windows_json"][1]["status"] == "pending"
+    assert created["playback_ready"] is False
+    assert updated["status"] == "complete"
+    assert updated["completed_windows"] == 2
+    assert updated["playback_ready"] is True
+    assert updated["created_at_utc"] == created["created_at_utc"]
+    assert datetime.fromisoformat(updated["updated_at_utc"]) >= datetime.fromisoformat(created["updated_at_utc"])
+
+
+def test_query_job_json_columns_round_trip_without_orjson(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    repo = SQLiteRepository("sqlite:///:memory:")
+    windows = [{"status": "failed", "errorDetail": "Estaci\u00f3n no disponible"}]
+
+    repo.upsert_analysis_query_job(_query_job_payload(windows_json=windows))
+
+    assert repo.get_analysis_query_job("job-1")["windows_json"] == windows
+    assert repo.get_analysis_query_job("job-1")["selected_types_json"] == ["speed", "direction"]
+
+
+def test_large_query_job_windows_are_stored_compressed():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    windows = [
+        {"start_utc": f"2024-07-{day:02d}T00:00:00+00:00", "end_utc": f"2024-07-{day + 1:02d}T00:00:00+00:00", "status": "cached"}
+        for day in range(1, 29)
+    ]
+
+    repo.upsert_analysis_query_job(_query_job_payload(windows_json=windows))
+
+    assert repo.get_analysis_query_job("job-1")["windows_json"] == windows
+    with repo._read_connection() as conn:
+        stored_type = conn.execute("SELECT typeof(windows_json) FROM analysis_query_jobs").fetchone()[0]
+    assert stored_type == "blob"
+
+
+def test_query_job_compression_threshold_counts_encoded_bytes():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    # About 620 characters but more than 1 KiB once encoded as UTF-8.
+    windows = [{"status": "cached", "errorDetail": "\u00f1" * 600}]
+
+    repo.upsert_analysis_query_job(_query_job_payload(windows_json=windows))
+
+    assert repo.get_analysis_query_job("job-1")["windows_json"] == windows
+    with repo._read_connection() as conn:
+        stored_type = conn.execute("SELECT typeof(windows_json) FROM analysis_query_jobs").fetchone()[0]
+    assert stored_type == "blob"
+
+
+def test_corrupt_compressed_query_job_windows_decode_as_empty():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    repo.upsert_analysis_query_job(_query_job_payload())
+    with repo._write_connection() as conn:
+        conn.execute("UPDATE analysis_query_jobs SET windows_json = ?", (b"\x78\x9c truncated",))
+
+    job = repo.get_analysis_query_job("job-1")
+
+    assert job is not None
+    assert job["windows_json"] == []
+
+
+def test_query_job_json_of_the_wrong_shape_decodes_as_empty():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    repo.upsert_analysis_query_job(_query_job_payload())
+
+    for selected_types_json, windows_json in (("{}", "[1]"), ('"speed"', "{}")):
+        with repo._write_connection() as conn:
+            conn.execute(
+                "UPDATE analysis_query_jobs SET selected_types_json = ?, windows_json = ?, updated_at_utc = updated_at_utc + 1",
+                (selected_types_json, windows_json),
+            )
+        job = repo.get_analysis_query_job("job-1")
+
+        assert job["selected_types_json"] == []
+        assert job["windows_json"] == []
+
+
+def test_query_job_reads_are_cached_until_updated_at_changes():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    repo.upsert_analysis_query_job(_query_job_payload())
+
+    first = repo.get_analysis_query_job("job-1")
+    first["status"] = "mutated"
+    first["windows_json"][0]["status"] = "mutated"
+    with repo._write_connection() as conn:
+        conn.execute("UPDATE analysis_query_jobs SET status = 'complete'")
+    second = repo.get_analysis_query_job("job-1")
+    with repo._write_connection() as conn:
+        conn.execute("UPDATE analysis_query_jobs SET status = 'failed', updated_at_utc = updated_at_utc + 1")
+    third = repo.get_analysis_query_job("job-1")
+
+    assert second["status"] == "running"
+    assert second["windows_json"][0]["status"] == "cached"
+    assert third["status"] == "failed"
+
+
+def test_query_job_upserts_always_advance_updated_at():
+    repo = SQLiteRepository("sqlite:///:memory:")
+    repo.upsert_analysis_query_job(_query_job_payload())
+    # A stored timestamp ahead of the clock, as after a wall-clock step backwards.
+    with repo._write_connection() as conn:
+        conn.execute("UPDATE analysis_query_jobs SET updated_at_utc = updated_at_utc + 3600000000")
+    first = repo.get_analysis_query_job("job-1")
+
+    repo.upsert_analysis_query_job(_query_job_payload(status="complete"))
+    second = repo.get_analysis_query_job("job-1")
+
+    assert second["status"] == "complete"
+    assert second["updated_at_utc"] > first["updated_at_utc"]
+
+
+def test_query_job_probe_index_exists_and_serves_the_probe(tmp_path):
+    repo = SQLiteRepository(f"sqlite:///{tmp_path / 'cache.db'}")
+
+    with repo._read_connection() as conn:
+        index = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_analysis_query_jobs_job_updated_at'"
+        ).fetchone()
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {_SQL_GET_ANALYSIS_QUERY_JOB_UPDATED_AT}", ("job-1",)).fetchall()
+
+    assert index is not None
+    assert "(job_id, updated_at_utc)" in index["sql"]
+    assert any("COVERING INDEX idx_analysis_query_jobs_job_updated_at" in row["detail"] for row in plan)
+
+
+def test_legacy_iso_query_job_timestamps_are_migrated(tmp_path):
+    db_path = tmp_path / "v2.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_ANALYSIS_QUERY_JOBS_TABLE_SQL.replace("_utc INTEGER", "_utc TEXT"))
+    conn.execute(
+        "INSERT INTO analysis_query_jobs VALUES "
+        "('job-1', '89064', '2024-07-01T00:00:00+00:00', '2024-08-01T00:00:00+00:00', '2022-07-01T00:00:00+00:00', "
+        "'UTC', 'none', '[]', '1h', 'running', 1, 0, 1, 0, 1, 0, 10, 0, 0, 'Fetching', NULL, '[]', "
+        "'2024-07-01T10:00:00.250000+00:00', '2024-07-01T11:00:00+00:00')"
+    )
+    conn.execute("PRAGMA user_version = 2")
+    conn.commit()
+    conn.close()
+
+    job = SQLiteRepository(f"sqlite:///{db_path}").get_analysis_query_job("job-1")
+
+    assert job["created_at_utc"] == "2024-07-01T10:00:00+00:00"
+    assert job["updated_at_utc"] == "2024-07-01T11:00:00+00:00"
+    assert job["status"] == "running"
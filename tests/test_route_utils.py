@@ -17,6 +17,13 @@ from app.api.route_utils import (
 )
 
 
+def _raiser(exc):
+    def call():
+        raise exc
+
+    return call
+
+
 def test_parse_timezone_or_400_valid_zone():
     tz = parse_timezone_or_400("Europe/Madrid")
     assert isinstance(tz, ZoneInfo)
@@ -67,7 +74,7 @@ def test_coerce_datetime_to_timezone_converts_aware_datetime():
 def test_call_service_or_http_maps_value_error_to_400():
     with pytest.raises(HTTPException) as exc:
         call_service_or_http(
-            lambda: (_ for _ in ()).throw(ValueError("bad request")),
+            _raiser(ValueError("bad request")),
             logger=logging.getLogger("test"),
             endpoint="analysis/test",
         )
@@ -78,7 +85,7 @@ def test_call_service_or_http_maps_value_error_to_400():
 def test_call_service_or_http_maps_runtime_error_to_502():
     with pytest.raises(HTTPException) as exc:
         call_service_or_http(
-            lambda: (_ for _ in ()).throw(RuntimeError("upstream failed")),
+            _raiser(RuntimeError("upstream failed")),
             logger=logging.getLogger("test"),
             endpoint="analysis/test",
             context={"station": "89064"},
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils import serialization
+from app.utils.serialization import json_dumps, json_loads
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_json_dumps_writes_compact_unescaped_text(json_backend):
+    value = {"status": "cached", "station": "Juan Carlos I ñ", "attempts": 2, "ratio": 0.5, "done": None}
+
+    assert json_dumps(value) == '{"status":"cached","station":"Juan Carlos I ñ","attempts":2,"ratio":0.5,"done":null}'
+
+
+def test_json_dumps_rejects_datetimes(json_backend):
+    with pytest.raises(TypeError):
+        json_dumps({"updated_at": datetime(2024, 7, 1, tzinfo=timezone.utc)})
+
+
+def test_json_loads_accepts_text_and_bytes(json_backend):
+    assert json_loads('[{"status":"ñ"}]') == [{"status": "ñ"}]
+    assert json_loads('[{"status":"ñ"}]'.encode("utf-8")) == [{"status": "ñ"}]
+    with pytest.raises(ValueError):
+        json_loads(b"[1,")
@@ -1,6 +1,9 @@
+from dataclasses import replace
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import pytest
+
 from app.models import (
     MeasurementType,
     PlaybackStep,
@@ -15,6 +18,10 @@ from app.services.antarctic_service import AntarcticService
 from app.core.config import Settings
 
 UTC = ZoneInfo("UTC")
+# The instants most tests are built around; datetimes are immutable, so sharing them is safe.
+_T0 = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
+_T0_PLUS_1H = datetime(2024, 1, 1, 1, 0, tzinfo=UTC)
+_T_JAN_15 = datetime(2024, 1, 15, 0, 0, tzinfo=UTC)
 
 
 class FakeRepo:
@@ -28,6 +35,26 @@ class FakeRepo:
         self.latest_measurement = None
         self.query_jobs = {}
 
+    # Tests assign rows/station_rows directly, so the lookups are indexed in the setters. The rows are
+    # stored as tuples: in-place edits would leave the indexes stale, so they must be reassignments.
+    @property
+    def rows(self):
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows):
+        self._rows = tuple(rows)
+        self._latest_row = max(self._rows, key=lambda row: row.measured_at_utc) if self._rows else None
+
+    @property
+    def station_rows(self):
+        return self._station_rows
+
+    @station_rows.setter
+    def station_rows(self, rows):
+        self._station_rows = tuple(rows)
+        self._station_by_id = {row.station_id: row for row in self._station_rows}
+
     def has_fresh_fetch_window(self, station_id, start_utc, end_utc, min_fetched_at_utc):
         return self.has_fresh_cache
 
@@ -38,17 +65,17 @@ class FakeRepo:
         self.rows = rows
         self.upsert_calls += 1
         self.has_fresh_cache = True
-        if rows:
-            self.latest_measurement = max(row.measured_at_utc for row in rows)
+        if self._latest_row is not None:
+            self.latest_measurement = self._latest_row.measured_at_utc
 
     def get_measurements(self, station_id, start_utc, end_utc):
-        return self.rows
+        return list(self.rows)
 
     def has_fresh_station_catalog(self, min_fetched_at_utc):
         return self.station_fresh
 
     def get_station_catalog(self):
-        return self.station_rows
+        return list(self.station_rows)
 
     def get_station_catalog_last_fetched_at(self):
         return self.station_fetched_at
@@ -56,30 +83,25 @@ class FakeRepo:
     def upsert_station_catalog(self, rows):
         self.station_rows = rows
         self.station_fresh = True
-        self.station_fetched_at = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
+        self.station_fetched_at = _T0
         return self.station_fetched_at
 
     def get_station_catalog_item(self, station_id):
-        for row in self.station_rows:
-            if row.station_id == station_id:
-                return row
-        return None
+        return self._station_by_id.get(station_id)
 
     def get_latest_measurement_timestamp(self, station_id):
         if self.latest_measurement is not None:
             return self.latest_measurement
-        if not self.rows:
+        if self._latest_row is None:
             return None
-        return max(row.measured_at_utc for row in self.rows)
+        return self._latest_row.measured_at_utc
 
     def get_latest_measurement(self, station_id):
-        if not self.rows:
-            return None
-        return max(self.rows, key=lambda row: row.measured_at_utc)
+        return self._latest_row
 
     def upsert_analysis_query_job(self, payload):
         payload = dict(payload)
-        payload["updated_at_utc"] = datetime(2024, 1, 1, 0, 0, tzinfo=UTC).isoformat()
+        payload["updated_at_utc"] = _T0.isoformat()
         self.query_jobs[payload["job_id"]] = payload
 
     def get_analysis_query_job(self, job_id):
@@ -89,17 +111,28 @@ class FakeRepo:
 class WindowAwareRepo(FakeRepo):
     def __init__(self, rows):
         super().__init__(rows, has_fresh_cache=False)
-        self._cached_windows = set()
+        self._window_rows = {}
 
     def has_cached_fetch_window(self, station_id, start_utc, end_utc):
-        return (station_id, start_utc, end_utc) in self._cached_windows
+        return (station_id, start_utc, end_utc) in self._window_rows
 
     def upsert_measurements(self, station_id, rows, start_utc, end_utc):
         self.rows = rows
         self.upsert_calls += 1
-        self._cached_windows.add((station_id, start_utc, end_utc))
-        if rows:
-            self.latest_measurement = max(row.measured_at_utc for row in rows)
+        self._window_rows[(station_id, start_utc, end_utc)] = rows
+        if self._latest_row is not None:
+            self.latest_measurement = self._latest_row.measured_at_utc
+
+    def get_measurements(self, station_id, start_utc, end_utc):
+        # Like the measurements primary key, one row per timestamp across overlapping windows.
+        rows = {
+            row.measured_at_utc: row
+            for (window_station_id, window_start, window_end), window_rows in self._window_rows.items()
+            if window_station_id == station_id and window_start <= end_utc and window_end >= start_utc
+            for row in window_rows
+            if start_utc <= row.measured_at_utc <= end_utc
+        }
+        return [rows[measured_at] for measured_at in sorted(rows)]
 
 
 class FakeClient:
@@ -157,26 +190,55 @@ class FakeInventoryClient:
         return self.rows
 
 
-def build_service(rows, has_fresh_cache=False):
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+# Settings is a frozen dataclass, so one instance is shared by every test.
+_SETTINGS = Settings(
+    aemet_api_key="dummy",
+    database_url="sqlite:///:memory:",
+    request_timeout_seconds=1.0,
+    gabriel_station_id="1",
+    juan_station_id="2",
+    cache_freshness_seconds=3600,
+    station_catalog_freshness_seconds=7 * 24 * 60 * 60,
+)
+_AEMET_STATION_SETTINGS = replace(_SETTINGS, gabriel_station_id="89070", juan_station_id="89064")
+
+
+# The envelope tests depend on these limits, so they are spelled out rather than left to model defaults.
+_SIMULATION_PARAMS = WindFarmSimulationParams(
+    turbineCount=6,
+    ratedPowerKw=900,
+    cutInSpeedMps=3.0,
+    ratedSpeedMps=12.0,
+    cutOutSpeedMps=25.0,
+    referenceAirDensityKgM3=1.225,
+    minOperatingTempC=-40.0,
+    maxOperatingTempC=45.0,
+    minOperatingPressureHpa=850.0,
+    maxOperatingPressureHpa=1085.0,
+)
+# Generation tests vary only the fields they exercise through model_copy(update=...).
+_STATION_A_ROW = SourceMeasurement(station_name="Station A", measured_at_utc=_T0, speed_mps=8.0, direction_deg=180.0)
+
+
+def build_service(rows, has_fresh_cache=False, latest_measurement=None):
+    settings = _SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=has_fresh_cache)
+    repo.latest_measurement = latest_measurement
     client = FakeClient(rows)
     return AntarcticService(settings, repo, client), repo, client
 
 
+def build_catalog_service(inventory_rows, settings=_SETTINGS):
+    repo = FakeRepo([], has_fresh_cache=False)
+    client = FakeInventoryClient(inventory_rows)
+    return AntarcticService(settings, repo, client), repo, client
+
+
 def test_no_aggregation_returns_all_types_by_default():
     rows = [
         SourceMeasurement(
             station_name="X",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             temperature_c=1,
             pressure_hpa=2,
             speed_mps=3,
@@ -187,8 +249,8 @@ def test_no_aggregation_returns_all_types_by_default():
 
     out = service.get_data(
         station=Station.GABRIEL_DE_CASTILLA,
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         aggregation=TimeAggregation.NONE,
         selected_types=[],
     )
@@ -209,8 +271,8 @@ def test_hourly_aggregation_and_filter_types():
 
     out = service.get_data(
         station=Station.JUAN_CARLOS_I,
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         aggregation=TimeAggregation.HOURLY,
         selected_types=[MeasurementType.TEMPERATURE, MeasurementType.DIRECTION],
     )
@@ -247,7 +309,7 @@ def test_geospatial_fields_are_exposed_for_mapping():
     rows = [
         SourceMeasurement(
             station_name="X",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             temperature_c=1,
             pressure_hpa=2,
             speed_mps=3,
@@ -260,8 +322,8 @@ def test_geospatial_fields_are_exposed_for_mapping():
 
     out = service.get_data(
         station=Station.GABRIEL_DE_CASTILLA,
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         aggregation=TimeAggregation.NONE,
         selected_types=[],
     )
@@ -274,14 +336,14 @@ def test_geospatial_fields_are_exposed_for_mapping():
 
 def test_cache_hit_skips_remote_fetch():
     rows = [
-        SourceMeasurement(station_name="X", measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC), temperature_c=1.0)
+        SourceMeasurement(station_name="X", measured_at_utc=_T0, temperature_c=1.0)
     ]
     service, repo, client = build_service(rows, has_fresh_cache=True)
 
     out = service.get_data(
         station=Station.GABRIEL_DE_CASTILLA,
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         aggregation=TimeAggregation.NONE,
         selected_types=[],
     )
@@ -293,14 +355,14 @@ def test_cache_hit_skips_remote_fetch():
 
 def test_cache_miss_fetches_remote_and_updates_db():
     rows = [
-        SourceMeasurement(station_name="X", measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC), temperature_c=1.0)
+        SourceMeasurement(station_name="X", measured_at_utc=_T0, temperature_c=1.0)
     ]
     service, repo, client = build_service(rows, has_fresh_cache=False)
 
     service.get_data(
         station=Station.GABRIEL_DE_CASTILLA,
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         aggregation=TimeAggregation.NONE,
         selected_types=[],
     )
@@ -318,15 +380,7 @@ def test_latest_availability_returns_suggested_window_when_data_found():
             temperature_c=1.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _SETTINGS
     repo = WindowAwareRepo([])
     client = FakeSequentialLatestClient([rows])
     service = AntarcticService(settings, repo, client)
@@ -346,15 +400,7 @@ def test_latest_availability_returns_suggested_window_when_data_found():
 
 def test_latest_availability_prefers_cached_latest_timestamp():
     newest = datetime(2024, 1, 15, 12, 0, tzinfo=UTC)
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _SETTINGS
     repo = FakeRepo([], has_fresh_cache=True)
     repo.latest_measurement = newest
     client = FakeLatestClient({})
@@ -368,15 +414,7 @@ def test_latest_availability_prefers_cached_latest_timestamp():
 
 
 def test_latest_availability_no_data_returns_note():
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _SETTINGS
     repo = WindowAwareRepo([])
     client = FakeLatestClient({})
     service = AntarcticService(settings, repo, client)
@@ -405,15 +443,7 @@ def test_latest_availability_backscans_prior_windows_when_recent_window_is_empty
             direction_deg=180.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _SETTINGS
     repo = WindowAwareRepo([])
     client = FakeSequentialLatestClient([[], rows])
     service = AntarcticService(settings, repo, client)
@@ -427,21 +457,10 @@ def test_latest_availability_backscans_prior_windows_when_recent_window_is_empty
 
 
 def test_station_catalog_cache_hit_uses_db_rows():
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
-    repo = FakeRepo([], has_fresh_cache=False)
+    service, repo, client = build_catalog_service([])
     repo.station_fresh = True
     repo.station_rows = [StationCatalogItem(stationId="9999A", stationName="Test Station")]
-    repo.station_fetched_at = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
-    client = FakeInventoryClient([])
-    service = AntarcticService(settings, repo, client)
+    repo.station_fetched_at = _T0
 
     out = service.get_station_catalog(force_refresh=False)
     by_id = {row.station_id: row for row in out.data}
@@ -455,18 +474,7 @@ def test_station_catalog_cache_hit_uses_db_rows():
 
 def test_station_catalog_force_refresh_fetches_remote_and_updates_cache():
     rows = [StationCatalogItem(stationId="1234X", stationName="Remote Station", province="Cadiz")]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
-    repo = FakeRepo([], has_fresh_cache=False)
-    client = FakeInventoryClient(rows)
-    service = AntarcticService(settings, repo, client)
+    service, repo, client = build_catalog_service(rows)
 
     out = service.get_station_catalog(force_refresh=True)
     by_id = {row.station_id: row for row in out.data}
@@ -483,18 +491,7 @@ def test_station_catalog_marks_antarctic_stations_with_endpoint_source():
         StationCatalogItem(stationId="1", stationName="GABRIEL DE CASTILLA"),
         StationCatalogItem(stationId="1234X", stationName="Remote Station", province="Cadiz"),
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
-    repo = FakeRepo([], has_fresh_cache=False)
-    client = FakeInventoryClient(rows)
-    service = AntarcticService(settings, repo, client)
+    service, repo, client = build_catalog_service(rows)
 
     out = service.get_station_catalog(force_refresh=True)
     by_id = {row.station_id: row for row in out.data}
@@ -507,18 +504,7 @@ def test_station_catalog_marks_antarctic_stations_with_endpoint_source():
 
 def test_station_catalog_seeds_known_antarctic_station_ids_when_missing_from_inventory():
     rows = [StationCatalogItem(stationId="1234X", stationName="Remote Station")]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
-    repo = FakeRepo([], has_fresh_cache=False)
-    client = FakeInventoryClient(rows)
-    service = AntarcticService(settings, repo, client)
+    service, repo, client = build_catalog_service(rows)
 
     out = service.get_station_catalog(force_refresh=True)
     by_id = {row.station_id: row for row in out.data}
@@ -532,7 +518,7 @@ def test_station_catalog_seeds_known_antarctic_station_ids_when_missing_from_inv
 
 
 def test_get_data_rejects_non_antarctic_station_when_catalog_marks_other_endpoint():
-    rows = [SourceMeasurement(station_name="X", measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC), temperature_c=1.0)]
+    rows = [SourceMeasurement(station_name="X", measured_at_utc=_T0, temperature_c=1.0)]
     service, repo, _ = build_service(rows, has_fresh_cache=True)
     repo.station_rows = [
         StationCatalogItem(
@@ -546,8 +532,8 @@ def test_get_data_rejects_non_antarctic_station_when_catalog_marks_other_endpoin
     try:
         service.get_data(
             station="1234X",
-            start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+            start_local=_T0,
+            end_local=_T0_PLUS_1H,
             aggregation=TimeAggregation.NONE,
             selected_types=[],
         )
@@ -557,14 +543,14 @@ def test_get_data_rejects_non_antarctic_station_when_catalog_marks_other_endpoin
 
 
 def test_get_data_rejects_station_not_in_antarctic_catalog():
-    rows = [SourceMeasurement(station_name="X", measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC), temperature_c=1.0)]
+    rows = [SourceMeasurement(station_name="X", measured_at_utc=_T0, temperature_c=1.0)]
     service, _, _ = build_service(rows, has_fresh_cache=True)
 
     try:
         service.get_data(
             station="9999X",
-            start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+            start_local=_T0,
+            end_local=_T0_PLUS_1H,
             aggregation=TimeAggregation.NONE,
             selected_types=[],
         )
@@ -574,18 +560,7 @@ def test_get_data_rejects_station_not_in_antarctic_catalog():
 
 
 def test_known_antarctic_ids_are_seeded_with_coordinates():
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="89070",
-        juan_station_id="89064",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
-    repo = FakeRepo([], has_fresh_cache=False)
-    client = FakeInventoryClient([])
-    service = AntarcticService(settings, repo, client)
+    service, repo, client = build_catalog_service([], settings=_AEMET_STATION_SETTINGS)
 
     out = service.get_station_catalog(force_refresh=True)
     by_id = {row.station_id: row for row in out.data}
@@ -600,23 +575,15 @@ def test_known_antarctic_ids_are_seeded_with_coordinates():
 
 
 def test_second_request_for_same_loaded_window_uses_cache_without_upstream_call():
-    rows = [SourceMeasurement(station_name="X", measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC), temperature_c=1.0)]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    rows = [SourceMeasurement(station_name="X", measured_at_utc=_T0, temperature_c=1.0)]
+    settings = _SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=False)
     repo.station_rows = [StationCatalogItem(stationId="1", stationName="Test Antarctic", dataEndpoint="antartida", isAntarcticStation=True)]
     client = FakeClient(rows)
     service = AntarcticService(settings, repo, client)
 
-    start = datetime(2024, 1, 1, 0, 0, tzinfo=UTC)
-    end = datetime(2024, 1, 1, 1, 0, tzinfo=UTC)
+    start = _T0
+    end = _T0_PLUS_1H
 
     service.get_data(station="1", start_local=start, end_local=end, aggregation=TimeAggregation.NONE, selected_types=[])
     service.get_data(station="1", start_local=start, end_local=end, aggregation=TimeAggregation.NONE, selected_types=[])
@@ -628,19 +595,11 @@ def test_get_data_fetches_full_calendar_month_windows_and_reuses_cached_windows(
     rows = [
         SourceMeasurement(
             station_name="X",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             temperature_c=1.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _SETTINGS
     repo = WindowAwareRepo(rows)
     client = FakeClient(rows)
     service = AntarcticService(settings, repo, client)
@@ -673,15 +632,7 @@ def test_analysis_bootstrap_exposes_two_selectable_stations_and_two_map_overlays
             altitude_m=12.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="89070",
-        juan_station_id="89064",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _AEMET_STATION_SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=True)
     repo.latest_measurement = rows[0].measured_at_utc
     client = FakeClient(rows)
@@ -702,15 +653,7 @@ def test_analysis_bootstrap_survives_warm_cache_failure():
             speed_mps=5.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="89070",
-        juan_station_id="89064",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _AEMET_STATION_SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=True)
     client = FakeClient(rows)
     service = AntarcticService(settings, repo, client)
@@ -736,15 +679,7 @@ def test_feasibility_snapshot_rejects_non_selectable_station():
             direction_deg=120.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="89070",
-        juan_station_id="89064",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _AEMET_STATION_SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=True)
     repo.latest_measurement = rows[0].measured_at_utc
     client = FakeClient(rows)
@@ -753,7 +688,7 @@ def test_feasibility_snapshot_rejects_non_selectable_station():
     try:
         service.get_feasibility_snapshot(
             station="89064R",
-            start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            start_local=_T0,
             aggregation=TimeAggregation.HOURLY,
             selected_types=[],
             timezone_input="UTC",
@@ -777,15 +712,7 @@ def test_feasibility_snapshot_caps_end_and_returns_two_series():
             altitude_m=12.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="89070",
-        juan_station_id="89064",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-    )
+    settings = _AEMET_STATION_SETTINGS
     repo = FakeRepo(rows, has_fresh_cache=True)
     repo.latest_measurement = rows[0].measured_at_utc
     client = FakeClient(rows)
@@ -793,7 +720,7 @@ def test_feasibility_snapshot_caps_end_and_returns_two_series():
 
     out = service.get_feasibility_snapshot(
         station="89064",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         aggregation=TimeAggregation.HOURLY,
         selected_types=[],
         timezone_input="UTC",
@@ -809,18 +736,17 @@ def test_playback_step_is_upsized_for_long_frame_ranges():
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             speed_mps=6.0,
             direction_deg=180.0,
             temperature_c=-3.0,
             pressure_hpa=995.0,
         )
     ]
-    service, repo, _ = build_service(rows, has_fresh_cache=True)
-    repo.latest_measurement = datetime(2024, 1, 30, 0, 0, tzinfo=UTC)
+    service, _, _ = build_service(rows, has_fresh_cache=True, latest_measurement=datetime(2024, 1, 30, 0, 0, tzinfo=UTC))
     out = service.get_playback_frames(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         end_local=datetime(2024, 1, 30, 0, 0, tzinfo=UTC),
         step=PlaybackStep.TEN_MINUTES,
         timezone_input="UTC",
@@ -832,20 +758,19 @@ def test_playback_wind_rose_uses_toward_heading_without_double_conversion():
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             speed_mps=6.0,
             direction_deg=0.0,
             temperature_c=-3.0,
             pressure_hpa=995.0,
         )
     ]
-    service, repo, _ = build_service(rows, has_fresh_cache=True)
-    repo.latest_measurement = datetime(2024, 1, 1, 1, 0, tzinfo=UTC)
+    service, _, _ = build_service(rows, has_fresh_cache=True, latest_measurement=_T0_PLUS_1H)
 
     out = service.get_playback_frames(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         step=PlaybackStep.HOURLY,
         timezone_input="UTC",
     )
@@ -859,7 +784,7 @@ def test_three_hour_playback_keeps_toward_heading_consistent():
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T0,
             speed_mps=6.0,
             direction_deg=0.0,
             temperature_c=-3.0,
@@ -867,7 +792,7 @@ def test_three_hour_playback_keeps_toward_heading_consistent():
         ),
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+            measured_at_utc=_T0_PLUS_1H,
             speed_mps=6.2,
             direction_deg=0.0,
             temperature_c=-2.8,
@@ -882,12 +807,11 @@ def test_three_hour_playback_keeps_toward_heading_consistent():
             pressure_hpa=994.8,
         ),
     ]
-    service, repo, _ = build_service(rows, has_fresh_cache=True)
-    repo.latest_measurement = datetime(2024, 1, 1, 3, 0, tzinfo=UTC)
+    service, _, _ = build_service(rows, has_fresh_cache=True, latest_measurement=datetime(2024, 1, 1, 3, 0, tzinfo=UTC))
 
     out = service.get_playback_frames(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         end_local=datetime(2024, 1, 1, 3, 0, tzinfo=UTC),
         step=PlaybackStep.THREE_HOURLY,
         timezone_input="UTC",
@@ -900,35 +824,22 @@ def test_three_hour_playback_keeps_toward_heading_consistent():
 
 def test_timeframe_analytics_returns_generation_when_simulation_params_passed():
     rows = [
-        SourceMeasurement(
-            station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            speed_mps=7.0,
-            direction_deg=180.0,
-            temperature_c=-2.0,
-            pressure_hpa=990.0,
-        ),
-        SourceMeasurement(
-            station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 10, tzinfo=UTC),
-            speed_mps=8.0,
-            direction_deg=190.0,
-            temperature_c=-1.0,
-            pressure_hpa=991.0,
+        _STATION_A_ROW.model_copy(update={"speed_mps": 7.0, "temperature_c": -2.0, "pressure_hpa": 990.0}),
+        _STATION_A_ROW.model_copy(
+            update={
+                "measured_at_utc": datetime(2024, 1, 1, 0, 10, tzinfo=UTC),
+                "direction_deg": 190.0,
+                "temperature_c": -1.0,
+                "pressure_hpa": 991.0,
+            }
         ),
     ]
     service, _, _ = build_service(rows, has_fresh_cache=True)
-    params = WindFarmSimulationParams(
-        turbineCount=6,
-        ratedPowerKw=900,
-        cutInSpeedMps=3.0,
-        ratedSpeedMps=12.0,
-        cutOutSpeedMps=25.0,
-    )
+    params = _SIMULATION_PARAMS
     out = service.get_timeframe_analytics(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         group_by=TimeframeGroupBy.HOUR,
         timezone_input="UTC",
         simulation_params=params,
@@ -938,106 +849,80 @@ def test_timeframe_analytics_returns_generation_when_simulation_params_passed():
 
 
 def test_timeframe_generation_accounts_for_air_density_correction():
-    cold_dense_rows = [
-        SourceMeasurement(
-            station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            speed_mps=8.0,
-            direction_deg=180.0,
-            temperature_c=-20.0,
-            pressure_hpa=1030.0,
-        )
-    ]
-    warm_thin_rows = [
-        SourceMeasurement(
-            station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            speed_mps=8.0,
-            direction_deg=180.0,
-            temperature_c=15.0,
-            pressure_hpa=980.0,
-        )
-    ]
+    cold_dense_rows = [_STATION_A_ROW.model_copy(update={"temperature_c": -20.0, "pressure_hpa": 1030.0})]
+    warm_thin_rows = [_STATION_A_ROW.model_copy(update={"temperature_c": 15.0, "pressure_hpa": 980.0})]
     cold_service, _, _ = build_service(cold_dense_rows, has_fresh_cache=True)
     warm_service, _, _ = build_service(warm_thin_rows, has_fresh_cache=True)
-    params = WindFarmSimulationParams(
-        turbineCount=6,
-        ratedPowerKw=900,
-        cutInSpeedMps=3.0,
-        ratedSpeedMps=12.0,
-        cutOutSpeedMps=25.0,
-        referenceAirDensityKgM3=1.225,
-    )
+    params = _SIMULATION_PARAMS
     cold = cold_service.get_timeframe_analytics(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         group_by=TimeframeGroupBy.HOUR,
         timezone_input="UTC",
         simulation_params=params,
     )
     warm = warm_service.get_timeframe_analytics(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         group_by=TimeframeGroupBy.HOUR,
         timezone_input="UTC",
         simulation_params=params,
     )
-    assert cold.buckets[0].estimated_generation_mwh is not None
-    assert warm.buckets[0].estimated_generation_mwh is not None
-    assert cold.buckets[0].estimated_generation_mwh > warm.buckets[0].estimated_generation_mwh
-
-
-def test_timeframe_generation_respects_operating_temperature_pressure_limits():
+    cold_mwh = cold.buckets[0].estimated_generation_mwh
+    warm_mwh = warm.buckets[0].estimated_generation_mwh
+    assert cold_mwh is not None
+    assert warm_mwh is not None
+    assert cold_mwh > warm_mwh
+
+
+@pytest.mark.parametrize(
+    ("temperature_c", "pressure_hpa", "expect_generation"),
+    [
+        pytest.param(-50.0, 990.0, False, id="below_min_temp"),
+        pytest.param(50.0, 990.0, False, id="above_max_temp"),
+        pytest.param(-2.0, 790.0, False, id="below_min_pressure"),
+        pytest.param(-2.0, 1090.0, False, id="above_max_pressure"),
+        pytest.param(-2.0, 990.0, True, id="nominal"),
+    ],
+)
+def test_timeframe_generation_respects_operating_temperature_pressure_limits(temperature_c, pressure_hpa, expect_generation):
+    # _SIMULATION_PARAMS operates between -40..45 C and 850..1085 hPa.
     rows = [
-        SourceMeasurement(
-            station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-            speed_mps=12.0,
-            direction_deg=180.0,
-            temperature_c=-50.0,
-            pressure_hpa=790.0,
+        _STATION_A_ROW.model_copy(
+            update={"speed_mps": 12.0, "temperature_c": temperature_c, "pressure_hpa": pressure_hpa}
         )
     ]
     service, _, _ = build_service(rows, has_fresh_cache=True)
-    params = WindFarmSimulationParams(
-        turbineCount=6,
-        ratedPowerKw=900,
-        cutInSpeedMps=3.0,
-        ratedSpeedMps=12.0,
-        cutOutSpeedMps=25.0,
-        minOperatingTempC=-40.0,
-        maxOperatingTempC=45.0,
-        minOperatingPressureHpa=850.0,
-        maxOperatingPressureHpa=1085.0,
-    )
     out = service.get_timeframe_analytics(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
-        end_local=datetime(2024, 1, 1, 1, 0, tzinfo=UTC),
+        start_local=_T0,
+        end_local=_T0_PLUS_1H,
         group_by=TimeframeGroupBy.HOUR,
         timezone_input="UTC",
-        simulation_params=params,
+        simulation_params=_SIMULATION_PARAMS,
     )
     assert out.buckets
-    assert out.buckets[0].estimated_generation_mwh == 0.0
+    if expect_generation:
+        assert out.buckets[0].estimated_generation_mwh > 0.0
+    else:
+        assert out.buckets[0].estimated_generation_mwh == 0.0
 
 
 def test_create_query_job_returns_cached_ready_when_window_already_available():
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 15, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T_JAN_15,
             speed_mps=5.0,
             direction_deg=200.0,
         )
     ]
-    service, repo, _ = build_service(rows, has_fresh_cache=True)
-    repo.latest_measurement = datetime(2024, 1, 15, 0, 0, tzinfo=UTC)
+    service, _, _ = build_service(rows, has_fresh_cache=True, latest_measurement=_T_JAN_15)
     out = service.create_query_job(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         end_local=None,
         timezone_input="UTC",
         playback_step=PlaybackStep.HOURLY,
@@ -1052,13 +937,12 @@ def test_create_query_job_uses_client_end_without_latest_probe():
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 15, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T_JAN_15,
             speed_mps=5.0,
             direction_deg=200.0,
         )
     ]
-    service, repo, _ = build_service(rows, has_fresh_cache=True)
-    repo.latest_measurement = None
+    service, _, _ = build_service(rows, has_fresh_cache=True, latest_measurement=None)
 
     def _raise_if_called(*_args, **_kwargs):
         raise AssertionError("latest availability probe should not run when end_local is provided")
@@ -1067,7 +951,7 @@ def test_create_query_job_uses_client_end_without_latest_probe():
 
     out = service.create_query_job(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         end_local=datetime(2024, 1, 31, 0, 0, tzinfo=UTC),
         timezone_input="UTC",
         playback_step=PlaybackStep.HOURLY,
@@ -1082,28 +966,19 @@ def test_query_job_progresses_via_status_polling_when_background_workers_disable
     rows = [
         SourceMeasurement(
             station_name="Station A",
-            measured_at_utc=datetime(2024, 1, 15, 0, 0, tzinfo=UTC),
+            measured_at_utc=_T_JAN_15,
             speed_mps=5.0,
             direction_deg=200.0,
         )
     ]
-    settings = Settings(
-        aemet_api_key="dummy",
-        database_url="sqlite:///:memory:",
-        request_timeout_seconds=1.0,
-        gabriel_station_id="1",
-        juan_station_id="2",
-        cache_freshness_seconds=3600,
-        station_catalog_freshness_seconds=7 * 24 * 60 * 60,
-        query_jobs_background_enabled=False,
-    )
+    settings = replace(_SETTINGS, query_jobs_background_enabled=False)
     repo = WindowAwareRepo(rows)
     client = FakeClient(rows)
     service = AntarcticService(settings, repo, client)
 
     created = service.create_query_job(
         station="1",
-        start_local=datetime(2024, 1, 1, 0, 0, tzinfo=UTC),
+        start_local=_T0,
         end_local=datetime(2024, 3, 1, 0, 0, tzinfo=UTC),
         timezone_input="UTC",
         playback_step=PlaybackStep.HOURLY,